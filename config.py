@@ -1,361 +1,425 @@
-import os
-from dotenv import load_dotenv
-
-# Загрузка переменных окружения
-load_dotenv()
-
-# Токен бота
-BOT_TOKEN = os.getenv("BOT_TOKEN")
-
-# Типы тренировок
-WORKOUT_TYPES = {
-    'workout_arms': '💪 Руки',
-    'workout_legs': '🦵 Ноги',
-    'workout_cardio': '🏃‍♂️ Кардио',
-    'workout_full_body': '🔄 Всё тело'
-}
-
-# Упражнения для каждого типа тренировки
-EXERCISES = {
-    "workout_arms": [
-        {
-            "name": "Отжимания",
-            "description": "3 подхода по 15 раз",
-            "photo_url": "https://imgur.com/07aHFUN"
-        },
-        {
-            "name": "Подтягивания",
-            "description": "3 подхода по 8-12 раз",
-            "photo_url": "https://imgur.com/hiro87U"
-        },
-        {
-            "name": "Сгибания рук с гантелями",
-            "description": "3 подхода по 12 раз",
-            "photo_url": "https://imgur.com/Knwq7Ob"
-        },
-        {
-            "name": "Тяга гантели в наклоне",
-            "description": "3 подхода по 15 раз",
-            "photo_url": "https://imgur.com/jyvu4fc"
-        },
-        {
-            "name": "разведение рук с гантелями лежа",
-            "description": "3 подхода по 12 раз",
-            "photo_url": "https://imgur.com/79287PI"
-        }
-    ],
-    "workout_legs": [
-        {
-            "name": "Приседания",
-            "description": "4 подхода по 15 раз",
-            "photo_url": "https://imgur.com/d8BbB6g"
-        },
-        {
-            "name": "Выпады",
-            "description": "3 подхода по 12 раз на каждую ногу",
-            "photo_url": "https://imgur.com/rzk9UVG"
-        },
-        {
-            "name": "Подъемы на носки",
-            "description": "4 подхода по 20 раз",
-            "photo_url": "https://imgur.com/7bnYWwc"
-        },
-        {
-            "name": "велосипед",
-            "description": "3 подхода по 15 раз",
-            "photo_url": "https://imgur.com/OcZEdFi"
-        },
-        {
-            "name": "Прыжковые приседания",
-            "description": "3 подхода по 30 секунд",
-            "photo_url": "https://imgur.com/1VacdBx"
-        }
-    ],
-    "workout_cardio": [
-        {
-            "name": "Бег на месте",
-            "description": "5 минут",
-            "photo_url": "https://imgur.com/g589VWp"
-        },
-        {
-            "name": "Прыжки со скакалкой",
-            "description": "3 минуты",
-            "photo_url": "https://imgur.com/OzZugDp"
-        },
-        {
-            "name": "Берпи",
-            "description": "30 секунд",
-            "photo_url": "https://imgur.com/Oeb2bMc"
-        },
-        {
-            "name": "Скалолаз",
-            "description": "1 минута",
-            "photo_url": "https://imgur.com/CEmy1xo"
-        },
-        {
-            "name": "Jumping Jacks",
-            "description": "2 минуты",
-            "photo_url": "https://imgur.com/BesNfTC"
-        }
-    ],
-    "workout_full_body": [
-        {
-            "name": "Берпи",
-            "description": "3 подхода по 10 раз",
-            "photo_url": "https://imgur.com/Oeb2bMc"
-        },
-        {
-            "name": "Прыжковые приседания",
-            "description": "3 подхода по 15 раз",
-            "photo_url": "https://imgur.com/1VacdBx"
-        },
-        {
-            "name": "Планка",
-            "description": "3 подхода по 45 секунд",
-            "photo_url": "https://imgur.com/f5eBCGy"
-        },
-        {
-            "name": "Отжимания",
-            "description": "3 подхода по 15 раз",
-            "photo_url": "https://imgur.com/07aHFUN"
-        },
-        {
-            "name": "Скручивания",
-            "description": "3 подхода по 20 раз",
-            "photo_url": "https://imgur.com/w5uO4kj"
-        }
-    ]
-}
-
-# Советы по здоровому образу жизни
-HEALTH_TIPS = [
-    "Пейте достаточно воды - минимум 2 литра в день! 💧",
-    "Старайтесь спать 7-8 часов каждый день для полноценного отдыха 😴",
-    "Делайте разминку перед каждой тренировкой 🤸‍♂️",
-    "Правильное питание - 80% успеха в достижении фитнес-целей 🥗",
-    "Регулярные тренировки эффективнее редких интенсивных 🏃‍♂️",
-    "Не забывайте про растяжку после тренировки 🧘‍♂️",
-    "Следите за своей осанкой в течение дня 👨‍💼",
-    "Делайте перерывы каждый час работы за компьютером 💻",
-    "Ходите пешком при любой возможности 🚶‍♂️",
-    "Включайте в рацион больше овощей и фруктов 🥬"
-]
-
-# Рецепты здорового питания
-HEALTHY_RECIPES = [
-    {
-        "name": "Овсяная каша с фруктами",
-        "ingredients": ["овсянка", "банан", "яблоко", "мед", "корица"],
-        "calories": 350,
-        "protein": 8,
-        "carbs": 65,
-        "fats": 6
-    },
-    {
-        "name": "Куриная грудка с овощами",
-        "ingredients": ["куриная грудка", "брокколи", "морковь", "оливковое масло"],
-        "calories": 400,
-        "protein": 35,
-        "carbs": 20,
-        "fats": 15
-    },
-    {
-        "name": "Протеиновый смузи",
-        "ingredients": ["банан", "молоко", "протеин", "овсянка", "мед"],
-        "calories": 300,
-        "protein": 25,
-        "carbs": 45,
-        "fats": 5
-    }
-]
-
-# Советы по тренировкам
-WORKOUT_TIPS = [
-    "Начинайте с легких весов и постепенно увеличивайте нагрузку",
-    "Следите за техникой выполнения упражнений",
-    "Делайте разминку перед каждой тренировкой",
-    "Не забывайте про отдых между подходами",
-    "Пейте воду во время тренировки",
-    "Правильное дыхание - ключ к эффективной тренировке",
-    "Чередуйте группы мышц в тренировках",
-    "Записывайте свои результаты для отслеживания прогресса"
-]
-
-# Советы по питанию
-NUTRITION_TIPS = [
-    "Ешьте больше белка для роста мышц",
-    "Не пропускайте завтрак",
-    "Планируйте приемы пищи заранее",
-    "Контролируйте размер порций",
-    "Ешьте медленно и тщательно пережевывайте пищу",
-    "Включайте в рацион полезные жиры",
-    "Пейте воду перед едой",
-    "Избегайте фастфуда и газированных напитков"
-]
-
-# Мотивационные цитаты
-MOTIVATION_TIPS = [
-    "Сила не в том, что ты можешь поднять, а в том, что ты не можешь опустить 💪",
-    "Каждая тренировка делает тебя сильнее 🏋️‍♂️",
-    "Твое тело может все. Это твой разум нужно убедить 🧠",
-    "Не останавливайся, когда устал. Останавливайся, когда закончил 🎯",
-    "Успех - это сумма небольших усилий, повторяющихся изо дня в день 📈",
-    "Поверь в себя, и другие поверят в тебя 🌟",
-    "Действуй сейчас. Завтра может быть поздно ⏰",
-    "Пусть твои успехи будут шумными, а неудачи тихими 🔊"
-]
-
-# Рецепты
-RECIPES = {
-    'loss': [
-        {
-            'name': '🥗 Салат с курицей',
-            'calories': 250,
-            'photo_url': 'https://i.imgur.com/ZeKqypn.jpg',
-            'ingredients': {
-                'куриная грудка': {'amount': 150, 'unit': 'г'},
-                'листья салата': {'amount': 50, 'unit': 'г'},
-                'помидоры': {'amount': 100, 'unit': 'г'},
-                'огурцы': {'amount': 100, 'unit': 'г'},
-                'оливковое масло': {'amount': 10, 'unit': 'мл'}
-            },
-            'base_weight': 70
-        },
-        {
-            'name': '🐟 Запеченная рыба с овощами',
-            'calories': 300,
-            'photo_url': 'https://i.imgur.com/3sBXm68.jpg',
-            'ingredients': {
-                'филе рыбы': {'amount': 200, 'unit': 'г'},
-                'брокколи': {'amount': 150, 'unit': 'г'},
-                'морковь': {'amount': 100, 'unit': 'г'},
-                'лук': {'amount': 50, 'unit': 'г'},
-                'оливковое масло': {'amount': 10, 'unit': 'мл'}
-            },
-            'base_weight': 70
-        },
-        {
-            'name': '🥑 Авокадо-тост с яйцом',
-            'calories': 350,
-            'photo_url': 'https://i.imgur.com/BADKEq0.jpg',
-            'ingredients': {
-                'цельнозерновой хлеб': {'amount': 60, 'unit': 'г'},
-                'авокадо': {'amount': 100, 'unit': 'г'},
-                'яйцо': {'amount': 1, 'unit': 'шт'},
-                'помидоры черри': {'amount': 50, 'unit': 'г'},
-                'зелень': {'amount': 10, 'unit': 'г'}
-            },
-            'base_weight': 70
-        },
-        {
-            'name': '🥣 Овощной суп',
-            'calories': 200,
-            'photo_url': 'https://i.imgur.com/Sx86Nvs.jpg',
-            'ingredients': {
-                'морковь': {'amount': 100, 'unit': 'г'},
-                'сельдерей': {'amount': 50, 'unit': 'г'},
-                'лук': {'amount': 50, 'unit': 'г'},
-                'капуста': {'amount': 100, 'unit': 'г'},
-                'томатная паста': {'amount': 20, 'unit': 'г'},
-                'оливковое масло': {'amount': 5, 'unit': 'мл'}
-            },
-            'base_weight': 70
-        }
-    ],
-    'gain': [
-        {
-            'name': '🍖 Стейк с рисом',
-            'calories': 650,
-            'photo_url': 'https://i.imgur.com/3pXM5nN.jpg',
-            'ingredients': {
-                'говяжий стейк': {'amount': 250, 'unit': 'г'},
-                'рис': {'amount': 150, 'unit': 'г'},
-                'овощи гриль': {'amount': 150, 'unit': 'г'},
-                'оливковое масло': {'amount': 15, 'unit': 'мл'},
-                'специи': {'amount': 5, 'unit': 'г'}
-            },
-            'base_weight': 70
-        },
-        {
-            'name': '🥤 Протеиновый смузи',
-            'calories': 400,
-            'photo_url': 'https://i.imgur.com/N2dtgHZ.jpg',
-            'ingredients': {
-                'банан': {'amount': 1, 'unit': 'шт'},
-                'протеин': {'amount': 30, 'unit': 'г'},
-                'молоко': {'amount': 300, 'unit': 'мл'},
-                'овсянка': {'amount': 50, 'unit': 'г'},
-                'арахисовая паста': {'amount': 20, 'unit': 'г'},
-                'мед': {'amount': 10, 'unit': 'г'}
-            },
-            'base_weight': 70
-        },
-        {
-            'name': '🍝 Паста с курицей',
-            'calories': 700,
-            'photo_url': 'https://i.imgur.com/DAAQd6O.jpg',
-            'ingredients': {
-                'паста': {'amount': 150, 'unit': 'г'},
-                'куриная грудка': {'amount': 200, 'unit': 'г'},
-                'сливки': {'amount': 100, 'unit': 'мл'},
-                'пармезан': {'amount': 30, 'unit': 'г'},
-                'чеснок': {'amount': 10, 'unit': 'г'},
-                'оливковое масло': {'amount': 15, 'unit': 'мл'}
-            },
-            'base_weight': 70
-        },
-        {
-            'name': '🥞 Протеиновые блины',
-            'calories': 550,
-            'photo_url': 'https://i.imgur.com/THYuSsM.jpg',
-            'ingredients': {
-                'овсяная мука': {'amount': 100, 'unit': 'г'},
-                'протеин': {'amount': 30, 'unit': 'г'},
-                'яйца': {'amount': 2, 'unit': 'шт'},
-                'молоко': {'amount': 200, 'unit': 'мл'},
-                'банан': {'amount': 1, 'unit': 'шт'},
-                'мед': {'amount': 20, 'unit': 'г'}
-            },
-            'base_weight': 70
-        }
-    ]
-}
-
-# Советы по тренировкам
-WORKOUT_TIPS = [
-    "Всегда начинайте с разминки",
-    "Следите за техникой выполнения",
-    "Пейте достаточно воды во время тренировки",
-    "Чередуйте группы мышц",
-    "Давайте мышцам отдохнуть между тренировками"
-]
-
-# Советы по питанию
-NUTRITION_TIPS = [
-    "Ешьте больше белка для роста мышц",
-    "Не пропускайте завтрак",
-    "Пейте воду перед едой",
-    "Ешьте медленно и тщательно жуйте",
-    "Включайте в рацион овощи и фрукты"
-]
-
-# Мотивационные советы
-MOTIVATION_TIPS = [
-    "Маленький прогресс - тоже прогресс!",
-    "Сравнивайте себя только с собой вчерашним",
-    "Каждая тренировка приближает вас к цели",
-    "Успех - это сумма маленьких усилий каждый день",
-    "Не сдавайтесь, когда тяжело"
-]
-
-# Таймауты
-INACTIVITY_TIMEOUT = 15 * 60  # 15 минут в секундах
-SESSION_TIMEOUT = 60 * 60     # 1 час в секундах
-
-# Калории, сжигаемые за минуту для разных типов тренировок
-CALORIES_PER_MINUTE = {
-    'workout_arms': 3,
-    'workout_legs': 4,
-    'workout_cardio': 5,
-    'workout_full_body': 5
+import os
+from dotenv import load_dotenv
+
+# Загрузка переменных окружения
+load_dotenv()
+
+# Токен бота
+BOT_TOKEN = os.getenv("BOT_TOKEN")
+
+# Настройки базы данных
+DB_BACKEND = os.getenv("DB_BACKEND", "sqlite")  # sqlite или memory (для тестов и замеров)
+DB_PATH = os.getenv("DB_PATH", "fitness_bot.db")
+DB_READERS = int(os.getenv("DB_READERS", "4"))  # Количество соединений только для чтения
+DB_SHARDS = int(os.getenv("DB_SHARDS", "1"))    # Число файлов-шардов (1 - без шардирования)
+
+# Отложенная запись: вставки фиксируются пачками раз в интервал или по набору строк
+DB_WRITE_BEHIND = os.getenv("DB_WRITE_BEHIND", "0") == "1"
+DB_FLUSH_INTERVAL_MS = int(os.getenv("DB_FLUSH_INTERVAL_MS", "50"))
+DB_FLUSH_MAX_ROWS = int(os.getenv("DB_FLUSH_MAX_ROWS", "500"))
+
+# Получение обновлений: polling (getUpdates) или webhook (HTTP-сервер aiohttp).
+# WEBHOOK_URL - внешний адрес бота без пути; если не задан, вебхук не регистрируется
+# при запуске (например, его уже зарегистрировал другой процесс)
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBAPP_HOST = os.getenv("WEBAPP_HOST", "0.0.0.0")
+WEBAPP_PORT = int(os.getenv("WEBAPP_PORT", "8080"))
+# SO_REUSEPORT: несколько процессов бота слушают один порт
+WEBAPP_REUSE_PORT = os.getenv("WEBAPP_REUSE_PORT", "0") == "1"
+
+# Хранилище состояний диалогов (FSM): memory или redis. Состояния и данные
+# брошенных диалогов удаляются Redis по истечении срока жизни в секундах
+FSM_STORAGE = os.getenv("FSM_STORAGE", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+FSM_STATE_TTL = int(os.getenv("FSM_STATE_TTL", str(24 * 60 * 60)))
+FSM_DATA_TTL = int(os.getenv("FSM_DATA_TTL", str(24 * 60 * 60)))
+
+# Служебный чат, в который при запуске загружаются картинки бота, чтобы
+# получить их file_id заранее (0 - без прогрева, file_id копятся по мере отправок)
+MEDIA_WARMUP_CHAT_ID = int(os.getenv("MEDIA_WARMUP_CHAT_ID", "0"))
+
+# Количество пользователей, для которых кэшируется последний записанный вес
+WEIGHT_CACHE_SIZE = 10000
+
+# Очередь исходящих сообщений: общий лимит Telegram ~30 сообщений в секунду
+# и не чаще одного сообщения в секунду в один чат
+SEND_RATE_LIMIT = float(os.getenv("SEND_RATE_LIMIT", "30"))
+SEND_CHAT_INTERVAL_MS = int(os.getenv("SEND_CHAT_INTERVAL_MS", "1000"))
+SEND_WORKERS = int(os.getenv("SEND_WORKERS", "8"))
+SEND_QUEUE_SIZE = int(os.getenv("SEND_QUEUE_SIZE", "100000"))
+
+# Часовой пояс напоминаний по умолчанию и пояса, доступные пользователю для выбора
+DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "Europe/Moscow")
+TIMEZONES = {
+    "Europe/Kaliningrad": "Калининград (UTC+2)",
+    "Europe/Moscow": "Москва (UTC+3)",
+    "Europe/Samara": "Самара (UTC+4)",
+    "Asia/Yekaterinburg": "Екатеринбург (UTC+5)",
+    "Asia/Omsk": "Омск (UTC+6)",
+    "Asia/Novosibirsk": "Новосибирск (UTC+7)",
+    "Asia/Krasnoyarsk": "Красноярск (UTC+7)",
+    "Asia/Irkutsk": "Иркутск (UTC+8)",
+    "Asia/Yakutsk": "Якутск (UTC+9)",
+    "Asia/Vladivostok": "Владивосток (UTC+10)",
+    "Asia/Magadan": "Магадан (UTC+11)",
+    "Asia/Kamchatka": "Камчатка (UTC+12)",
+}
+
+# Картинка приветствия и главного меню
+WELCOME_PHOTO_URL = "https://i.imgur.com/U2KpzSU.jpg"
+
+# Типы тренировок
+WORKOUT_TYPES = {
+    'workout_arms': '💪 Руки',
+    'workout_legs': '🦵 Ноги',
+    'workout_cardio': '🏃‍♂️ Кардио',
+    'workout_full_body': '🔄 Всё тело'
+}
+
+# Упражнения для каждого типа тренировки
+EXERCISES = {
+    "workout_arms": [
+        {
+            "name": "Отжимания",
+            "description": "3 подхода по 15 раз",
+            "photo_url": "https://imgur.com/07aHFUN"
+        },
+        {
+            "name": "Подтягивания",
+            "description": "3 подхода по 8-12 раз",
+            "photo_url": "https://imgur.com/hiro87U"
+        },
+        {
+            "name": "Сгибания рук с гантелями",
+            "description": "3 подхода по 12 раз",
+            "photo_url": "https://imgur.com/Knwq7Ob"
+        },
+        {
+            "name": "Тяга гантели в наклоне",
+            "description": "3 подхода по 15 раз",
+            "photo_url": "https://imgur.com/jyvu4fc"
+        },
+        {
+            "name": "разведение рук с гантелями лежа",
+            "description": "3 подхода по 12 раз",
+            "photo_url": "https://imgur.com/79287PI"
+        }
+    ],
+    "workout_legs": [
+        {
+            "name": "Приседания",
+            "description": "4 подхода по 15 раз",
+            "photo_url": "https://imgur.com/d8BbB6g"
+        },
+        {
+            "name": "Выпады",
+            "description": "3 подхода по 12 раз на каждую ногу",
+            "photo_url": "https://imgur.com/rzk9UVG"
+        },
+        {
+            "name": "Подъемы на носки",
+            "description": "4 подхода по 20 раз",
+            "photo_url": "https://imgur.com/7bnYWwc"
+        },
+        {
+            "name": "велосипед",
+            "description": "3 подхода по 15 раз",
+            "photo_url": "https://imgur.com/OcZEdFi"
+        },
+        {
+            "name": "Прыжковые приседания",
+            "description": "3 подхода по 30 секунд",
+            "photo_url": "https://imgur.com/1VacdBx"
+        }
+    ],
+    "workout_cardio": [
+        {
+            "name": "Бег на месте",
+            "description": "5 минут",
+            "photo_url": "https://imgur.com/g589VWp"
+        },
+        {
+            "name": "Прыжки со скакалкой",
+            "description": "3 минуты",
+            "photo_url": "https://imgur.com/OzZugDp"
+        },
+        {
+            "name": "Берпи",
+            "description": "30 секунд",
+            "photo_url": "https://imgur.com/Oeb2bMc"
+        },
+        {
+            "name": "Скалолаз",
+            "description": "1 минута",
+            "photo_url": "https://imgur.com/CEmy1xo"
+        },
+        {
+            "name": "Jumping Jacks",
+            "description": "2 минуты",
+            "photo_url": "https://imgur.com/BesNfTC"
+        }
+    ],
+    "workout_full_body": [
+        {
+            "name": "Берпи",
+            "description": "3 подхода по 10 раз",
+            "photo_url": "https://imgur.com/Oeb2bMc"
+        },
+        {
+            "name": "Прыжковые приседания",
+            "description": "3 подхода по 15 раз",
+            "photo_url": "https://imgur.com/1VacdBx"
+        },
+        {
+            "name": "Планка",
+            "description": "3 подхода по 45 секунд",
+            "photo_url": "https://imgur.com/f5eBCGy"
+        },
+        {
+            "name": "Отжимания",
+            "description": "3 подхода по 15 раз",
+            "photo_url": "https://imgur.com/07aHFUN"
+        },
+        {
+            "name": "Скручивания",
+            "description": "3 подхода по 20 раз",
+            "photo_url": "https://imgur.com/w5uO4kj"
+        }
+    ]
+}
+
+# Советы по здоровому образу жизни
+HEALTH_TIPS = [
+    "Пейте достаточно воды - минимум 2 литра в день! 💧",
+    "Старайтесь спать 7-8 часов каждый день для полноценного отдыха 😴",
+    "Делайте разминку перед каждой тренировкой 🤸‍♂️",
+    "Правильное питание - 80% успеха в достижении фитнес-целей 🥗",
+    "Регулярные тренировки эффективнее редких интенсивных 🏃‍♂️",
+    "Не забывайте про растяжку после тренировки 🧘‍♂️",
+    "Следите за своей осанкой в течение дня 👨‍💼",
+    "Делайте перерывы каждый час работы за компьютером 💻",
+    "Ходите пешком при любой возможности 🚶‍♂️",
+    "Включайте в рацион больше овощей и фруктов 🥬"
+]
+
+# Рецепты здорового питания
+HEALTHY_RECIPES = [
+    {
+        "name": "Овсяная каша с фруктами",
+        "ingredients": ["овсянка", "банан", "яблоко", "мед", "корица"],
+        "calories": 350,
+        "protein": 8,
+        "carbs": 65,
+        "fats": 6
+    },
+    {
+        "name": "Куриная грудка с овощами",
+        "ingredients": ["куриная грудка", "брокколи", "морковь", "оливковое масло"],
+        "calories": 400,
+        "protein": 35,
+        "carbs": 20,
+        "fats": 15
+    },
+    {
+        "name": "Протеиновый смузи",
+        "ingredients": ["банан", "молоко", "протеин", "овсянка", "мед"],
+        "calories": 300,
+        "protein": 25,
+        "carbs": 45,
+        "fats": 5
+    }
+]
+
+# Советы по тренировкам
+WORKOUT_TIPS = [
+    "Начинайте с легких весов и постепенно увеличивайте нагрузку",
+    "Следите за техникой выполнения упражнений",
+    "Делайте разминку перед каждой тренировкой",
+    "Не забывайте про отдых между подходами",
+    "Пейте воду во время тренировки",
+    "Правильное дыхание - ключ к эффективной тренировке",
+    "Чередуйте группы мышц в тренировках",
+    "Записывайте свои результаты для отслеживания прогресса"
+]
+
+# Советы по питанию
+NUTRITION_TIPS = [
+    "Ешьте больше белка для роста мышц",
+    "Не пропускайте завтрак",
+    "Планируйте приемы пищи заранее",
+    "Контролируйте размер порций",
+    "Ешьте медленно и тщательно пережевывайте пищу",
+    "Включайте в рацион полезные жиры",
+    "Пейте воду перед едой",
+    "Избегайте фастфуда и газированных напитков"
+]
+
+# Мотивационные цитаты
+MOTIVATION_TIPS = [
+    "Сила не в том, что ты можешь поднять, а в том, что ты не можешь опустить 💪",
+    "Каждая тренировка делает тебя сильнее 🏋️‍♂️",
+    "Твое тело может все. Это твой разум нужно убедить 🧠",
+    "Не останавливайся, когда устал. Останавливайся, когда закончил 🎯",
+    "Успех - это сумма небольших усилий, повторяющихся изо дня в день 📈",
+    "Поверь в себя, и другие поверят в тебя 🌟",
+    "Действуй сейчас. Завтра может быть поздно ⏰",
+    "Пусть твои успехи будут шумными, а неудачи тихими 🔊"
+]
+
+# Рецепты
+RECIPES = {
+    'loss': [
+        {
+            'name': '🥗 Салат с курицей',
+            'calories': 250,
+            'photo_url': 'https://i.imgur.com/ZeKqypn.jpg',
+            'ingredients': {
+                'куриная грудка': {'amount': 150, 'unit': 'г'},
+                'листья салата': {'amount': 50, 'unit': 'г'},
+                'помидоры': {'amount': 100, 'unit': 'г'},
+                'огурцы': {'amount': 100, 'unit': 'г'},
+                'оливковое масло': {'amount': 10, 'unit': 'мл'}
+            },
+            'base_weight': 70
+        },
+        {
+            'name': '🐟 Запеченная рыба с овощами',
+            'calories': 300,
+            'photo_url': 'https://i.imgur.com/3sBXm68.jpg',
+            'ingredients': {
+                'филе рыбы': {'amount': 200, 'unit': 'г'},
+                'брокколи': {'amount': 150, 'unit': 'г'},
+                'морковь': {'amount': 100, 'unit': 'г'},
+                'лук': {'amount': 50, 'unit': 'г'},
+                'оливковое масло': {'amount': 10, 'unit': 'мл'}
+            },
+            'base_weight': 70
+        },
+        {
+            'name': '🥑 Авокадо-тост с яйцом',
+            'calories': 350,
+            'photo_url': 'https://i.imgur.com/BADKEq0.jpg',
+            'ingredients': {
+                'цельнозерновой хлеб': {'amount': 60, 'unit': 'г'},
+                'авокадо': {'amount': 100, 'unit': 'г'},
+                'яйцо': {'amount': 1, 'unit': 'шт'},
+                'помидоры черри': {'amount': 50, 'unit': 'г'},
+                'зелень': {'amount': 10, 'unit': 'г'}
+            },
+            'base_weight': 70
+        },
+        {
+            'name': '🥣 Овощной суп',
+            'calories': 200,
+            'photo_url': 'https://i.imgur.com/Sx86Nvs.jpg',
+            'ingredients': {
+                'морковь': {'amount': 100, 'unit': 'г'},
+                'сельдерей': {'amount': 50, 'unit': 'г'},
+                'лук': {'amount': 50, 'unit': 'г'},
+                'капуста': {'amount': 100, 'unit': 'г'},
+                'томатная паста': {'amount': 20, 'unit': 'г'},
+                'оливковое масло': {'amount': 5, 'unit': 'мл'}
+            },
+            'base_weight': 70
+        }
+    ],
+    'gain': [
+        {
+            'name': '🍖 Стейк с рисом',
+            'calories': 650,
+            'photo_url': 'https://i.imgur.com/3pXM5nN.jpg',
+            'ingredients': {
+                'говяжий стейк': {'amount': 250, 'unit': 'г'},
+                'рис': {'amount': 150, 'unit': 'г'},
+                'овощи гриль': {'amount': 150, 'unit': 'г'},
+                'оливковое масло': {'amount': 15, 'unit': 'мл'},
+                'специи': {'amount': 5, 'unit': 'г'}
+            },
+            'base_weight': 70
+        },
+        {
+            'name': '🥤 Протеиновый смузи',
+            'calories': 400,
+            'photo_url': 'https://i.imgur.com/N2dtgHZ.jpg',
+            'ingredients': {
+                'банан': {'amount': 1, 'unit': 'шт'},
+                'протеин': {'amount': 30, 'unit': 'г'},
+                'молоко': {'amount': 300, 'unit': 'мл'},
+                'овсянка': {'amount': 50, 'unit': 'г'},
+                'арахисовая паста': {'amount': 20, 'unit': 'г'},
+                'мед': {'amount': 10, 'unit': 'г'}
+            },
+            'base_weight': 70
+        },
+        {
+            'name': '🍝 Паста с курицей',
+            'calories': 700,
+            'photo_url': 'https://i.imgur.com/DAAQd6O.jpg',
+            'ingredients': {
+                'паста': {'amount': 150, 'unit': 'г'},
+                'куриная грудка': {'amount': 200, 'unit': 'г'},
+                'сливки': {'amount': 100, 'unit': 'мл'},
+                'пармезан': {'amount': 30, 'unit': 'г'},
+                'чеснок': {'amount': 10, 'unit': 'г'},
+                'оливковое масло': {'amount': 15, 'unit': 'мл'}
+            },
+            'base_weight': 70
+        },
+        {
+            'name': '🥞 Протеиновые блины',
+            'calories': 550,
+            'photo_url': 'https://i.imgur.com/THYuSsM.jpg',
+            'ingredients': {
+                'овсяная мука': {'amount': 100, 'unit': 'г'},
+                'протеин': {'amount': 30, 'unit': 'г'},
+                'яйца': {'amount': 2, 'unit': 'шт'},
+                'молоко': {'amount': 200, 'unit': 'мл'},
+                'банан': {'amount': 1, 'unit': 'шт'},
+                'мед': {'amount': 20, 'unit': 'г'}
+            },
+            'base_weight': 70
+        }
+    ]
+}
+
+# Советы по тренировкам
+WORKOUT_TIPS = [
+    "Всегда начинайте с разминки",
+    "Следите за техникой выполнения",
+    "Пейте достаточно воды во время тренировки",
+    "Чередуйте группы мышц",
+    "Давайте мышцам отдохнуть между тренировками"
+]
+
+# Советы по питанию
+NUTRITION_TIPS = [
+    "Ешьте больше белка для роста мышц",
+    "Не пропускайте завтрак",
+    "Пейте воду перед едой",
+    "Ешьте медленно и тщательно жуйте",
+    "Включайте в рацион овощи и фрукты"
+]
+
+# Мотивационные советы
+MOTIVATION_TIPS = [
+    "Маленький прогресс - тоже прогресс!",
+    "Сравнивайте себя только с собой вчерашним",
+    "Каждая тренировка приближает вас к цели",
+    "Успех - это сумма маленьких усилий каждый день",
+    "Не сдавайтесь, когда тяжело"
+]
+
+# Таймауты
+INACTIVITY_TIMEOUT = 15 * 60  # 15 минут в секундах
+SESSION_TIMEOUT = 60 * 60     # 1 час в секундах
+
+# Калории, сжигаемые за минуту для разных типов тренировок
+CALORIES_PER_MINUTE = {
+    'workout_arms': 3,
+    'workout_legs': 4,
+    'workout_cardio': 5,
+    'workout_full_body': 5
 } 
\ No newline at end of file
@@ -1,265 +1,958 @@
-import aiosqlite
-from datetime import datetime
-
-class Database:
-    """Класс для работы с базой данных"""
-    
-    def __init__(self, db_name: str = "fitness_bot.db"):
-        self.db_name = db_name
-    
-    async def create_tables(self):
-        """Создание необходимых таблиц"""
-        async with aiosqlite.connect(self.db_name) as db:
-            # Таблица пользователей
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id INTEGER PRIMARY KEY,
-                    username TEXT,
-                    registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Таблица тренировок
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS workouts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    workout_type TEXT,
-                    duration INTEGER,
-                    calories_burned INTEGER,
-                    exercises_completed INTEGER,
-                    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            """)
-            
-            # Таблица записей веса
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS weight_records (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    weight REAL,
-                    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            """)
-            
-            # Таблица измерений тела
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS measurements (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    chest REAL,
-                    waist REAL,
-                    hips REAL,
-                    biceps REAL,
-                    thighs REAL,
-                    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            """)
-            
-            # Таблица напоминаний о тренировках
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS workout_reminders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    time TEXT,
-                    days TEXT,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            """)
-            
-            # Таблица напоминаний о питании
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS meal_reminders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    meal_count INTEGER,
-                    meal_times TEXT,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            """)
-            
-            # Таблица дневника питания
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS meal_diary (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    meal_name TEXT,
-                    calories REAL,
-                    proteins REAL,
-                    fats REAL,
-                    carbs REAL,
-                    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            """)
-            
-            await db.commit()
-    
-    async def add_user(self, user_id: int, username: str = None):
-        """Добавление нового пользователя"""
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                "INSERT OR IGNORE INTO users (user_id, username) VALUES (?, ?)",
-                (user_id, username)
-            )
-            await db.commit()
-    
-    async def save_workout(self, user_id: int, workout_type: str, duration: int,
-                          calories_burned: int, exercises_completed: int):
-        """Сохранение информации о завершенной тренировке"""
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                """
-                INSERT INTO workouts 
-                (user_id, workout_type, duration, calories_burned, exercises_completed)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (user_id, workout_type, duration, calories_burned, exercises_completed)
-            )
-            await db.commit()
-    
-    async def record_weight(self, user_id: int, weight: float):
-        """Запись веса пользователя"""
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                "INSERT INTO weight_records (user_id, weight) VALUES (?, ?)",
-                (user_id, weight)
-            )
-            await db.commit()
-    
-    async def record_measurements(self, user_id: int, chest: float, waist: float,
-                                hips: float, biceps: float, thighs: float):
-        """Запись измерений тела"""
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                """
-                INSERT INTO measurements 
-                (user_id, chest, waist, hips, biceps, thighs)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (user_id, chest, waist, hips, biceps, thighs)
-            )
-            await db.commit()
-    
-    async def get_user_statistics(self, user_id: int) -> tuple:
-        """Получение общей статистики пользователя"""
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                """
-                SELECT 
-                    COUNT(*) as total_workouts,
-                    SUM(duration) as total_duration,
-                    SUM(calories_burned) as total_calories,
-                    SUM(exercises_completed) as total_exercises
-                FROM workouts
-                WHERE user_id = ?
-                """,
-                (user_id,)
-            ) as cursor:
-                return await cursor.fetchone()
-    
-    async def get_weight_history(self, user_id: int) -> list:
-        """Получение истории изменения веса"""
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                """
-                SELECT weight, recorded_at
-                FROM weight_records
-                WHERE user_id = ?
-                ORDER BY recorded_at DESC
-                LIMIT 10
-                """,
-                (user_id,)
-            ) as cursor:
-                return await cursor.fetchall()
-    
-    async def get_measurements_history(self, user_id: int) -> list:
-        """Получение истории измерений"""
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                """
-                SELECT chest, waist, hips, biceps, thighs, recorded_at
-                FROM measurements
-                WHERE user_id = ?
-                ORDER BY recorded_at DESC
-                LIMIT 5
-                """,
-                (user_id,)
-            ) as cursor:
-                return await cursor.fetchall()
-    
-    async def get_recent_workouts(self, user_id: int, limit: int = 5) -> list:
-        """Получение последних тренировок пользователя"""
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                """
-                SELECT workout_type, duration, calories_burned, completed_at
-                FROM workouts
-                WHERE user_id = ?
-                ORDER BY completed_at DESC
-                LIMIT ?
-                """,
-                (user_id, limit)
-            ) as cursor:
-                return await cursor.fetchall()
-    
-    async def save_workout_reminder(self, user_id: int, time: str, days: str):
-        """Сохранение напоминания о тренировках"""
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                """
-                INSERT INTO workout_reminders (user_id, time, days)
-                VALUES (?, ?, ?)
-                """,
-                (user_id, time, days)
-            )
-            await db.commit()
-    
-    async def save_meal_reminder(self, user_id: int, meal_count: int, meal_times: str):
-        """Сохранение напоминания о питании"""
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                """
-                INSERT INTO meal_reminders (user_id, meal_count, meal_times)
-                VALUES (?, ?, ?)
-                """,
-                (user_id, meal_count, meal_times)
-            )
-            await db.commit()
-    
-    async def get_workout_reminders(self, user_id: int) -> tuple:
-        """Получение напоминаний о тренировках"""
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                """
-                SELECT time, days
-                FROM workout_reminders
-                WHERE user_id = ? AND is_active = TRUE
-                ORDER BY created_at DESC
-                LIMIT 1
-                """,
-                (user_id,)
-            ) as cursor:
-                return await cursor.fetchone()
-    
-    async def get_meal_reminders(self, user_id: int) -> tuple:
-        """Получение напоминаний о питании"""
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                """
-                SELECT meal_count, meal_times
-                FROM meal_reminders
-                WHERE user_id = ? AND is_active = TRUE
-                ORDER BY created_at DESC
-                LIMIT 1
-                """,
-                (user_id,)
-            ) as cursor:
-                return await cursor.fetchone() 
\ No newline at end of file
+import asyncio
+import logging
+import time
+import zlib
+import aiosqlite
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from config import (
+    DB_PATH, DB_READERS, DB_WRITE_BEHIND, DB_FLUSH_INTERVAL_MS, DB_FLUSH_MAX_ROWS,
+    DB_SHARDS, WEIGHT_CACHE_SIZE
+)
+from migrations import apply_migrations
+from schedules import ALL_DAYS_MASK, pack_minutes, unpack_minutes
+
+# PRAGMA соединения-писателя (режим журнала WAL сохраняется в самом файле базы)
+WRITER_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",     # 16 МБ страничного кэша
+    "PRAGMA mmap_size = 268435456",   # 256 МБ отображения файла в память
+    "PRAGMA busy_timeout = 5000",
+)
+
+# PRAGMA соединений только для чтения
+READER_PRAGMAS = (
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Отметка отсутствия записи в кэше (вес пользователя может быть не записан)
+_MISSING = object()
+
+# Таблицы расписаний напоминаний по типу
+REMINDER_TABLES = {
+    "workout": "workout_reminders",
+    "meal": "meal_reminders",
+}
+
+# Номера типов напоминаний в журнале доставки
+REMINDER_IDS = {
+    "workout": 1,
+    "meal": 2,
+}
+
+def local_day_bounds(day: date) -> tuple:
+    """Границы локальных суток в секундах эпохи: полуинтервал [начало, конец)"""
+    start = datetime.combine(day, datetime.min.time())
+    return int(start.timestamp()), int((start + timedelta(days=1)).timestamp())
+
+async def _connect(database: str, pragmas: tuple, **kwargs):
+    """Открытие соединения с применением PRAGMA"""
+    conn = await aiosqlite.connect(database, **kwargs)
+    for pragma in pragmas:
+        # Курсор закрывается сразу, иначе он удерживает снимок чтения
+        async with conn.execute(pragma):
+            pass
+    return conn
+
+class Database:
+    """Класс для работы с базой данных"""
+
+    def __init__(self, db_name: str = DB_PATH, readers: int = DB_READERS,
+                 write_behind: bool = DB_WRITE_BEHIND,
+                 flush_interval_ms: int = DB_FLUSH_INTERVAL_MS,
+                 flush_max_rows: int = DB_FLUSH_MAX_ROWS):
+        self.db_name = db_name
+        self.readers = max(1, readers)
+
+        # Одно соединение-писатель сериализует все изменения,
+        # чтение идет параллельно через соединения mode=ro
+        self._writer_conn = None
+        self._writer_lock = asyncio.Lock()
+        self._reader_pool = None
+        self._reader_conns = []
+
+        # Время ожидания соединений: [число захватов, суммарное ожидание, максимум]
+        self._wait_stats = {"writer": [0, 0.0, 0.0], "reader": [0, 0.0, 0.0]}
+
+        # Отложенная запись: вставки копятся в очереди и фиксируются пачками
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_rows = max(1, flush_max_rows)
+        self._write_queue = None
+        self._writer_task = None
+
+        # Кэш последнего записанного веса пользователей (LRU)
+        self._latest_weight = OrderedDict()
+
+    async def open(self):
+        """Открытие соединения-писателя и пула читателей"""
+        if self._writer_conn is not None:
+            return
+
+        # Писатель открывается первым: он создает файл базы и включает WAL
+        self._writer_conn = await _connect(self.db_name, WRITER_PRAGMAS)
+
+        reader_uri = f"{Path(self.db_name).resolve().as_uri()}?mode=ro"
+        pool = asyncio.Queue(maxsize=self.readers)
+        for _ in range(self.readers):
+            conn = await _connect(reader_uri, READER_PRAGMAS, uri=True)
+            self._reader_conns.append(conn)
+            pool.put_nowait(conn)
+        self._reader_pool = pool
+
+        if self.write_behind:
+            self._write_queue = asyncio.Queue(maxsize=self.flush_max_rows * 10)
+            self._writer_task = asyncio.create_task(self._write_behind_loop())
+
+    async def close(self):
+        """Закрытие всех соединений с дозаписью очереди"""
+        if self._writer_conn is None:
+            return
+
+        if self._writer_task is not None:
+            if not self._writer_task.done():
+                await self._write_queue.put(None)
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+            self._write_queue = None
+
+        self._reader_pool = None
+        connections, self._reader_conns = self._reader_conns, []
+        for conn in connections:
+            await conn.close()
+
+        writer, self._writer_conn = self._writer_conn, None
+        async with self._writer_lock:
+            await writer.close()
+
+    def _record_wait(self, kind: str, waited: float):
+        """Учет времени ожидания соединения"""
+        stats = self._wait_stats[kind]
+        stats[0] += 1
+        stats[1] += waited
+        stats[2] = max(stats[2], waited)
+
+    def get_pool_metrics(self) -> dict:
+        """Метрики ожидания соединений писателя и читателей"""
+        return {
+            kind: {
+                "acquisitions": count,
+                "wait_total": total,
+                "wait_avg": total / count if count else 0.0,
+                "wait_max": longest,
+            }
+            for kind, (count, total, longest) in self._wait_stats.items()
+        }
+
+    @asynccontextmanager
+    async def _writer(self):
+        """Монопольный доступ к соединению-писателю"""
+        if self._writer_conn is None:
+            raise RuntimeError("База данных не открыта: вызовите Database.open()")
+
+        started = time.perf_counter()
+        async with self._writer_lock:
+            self._record_wait("writer", time.perf_counter() - started)
+            conn = self._writer_conn
+            try:
+                yield conn
+            except BaseException:
+                # Не оставляем писателя с незавершенной транзакцией
+                if conn.in_transaction:
+                    await conn.rollback()
+                raise
+
+    @asynccontextmanager
+    async def _reader(self):
+        """Получение соединения только для чтения из пула"""
+        if self._reader_pool is None:
+            raise RuntimeError("База данных не открыта: вызовите Database.open()")
+
+        pool = self._reader_pool
+        started = time.perf_counter()
+        conn = await pool.get()
+        self._record_wait("reader", time.perf_counter() - started)
+        try:
+            yield conn
+        finally:
+            pool.put_nowait(conn)
+
+    async def _write(self, sql: str, params: tuple):
+        """Выполнение вставки: сразу или через очередь отложенной записи"""
+        if self._write_queue is None:
+            async with self._writer() as db:
+                await db.execute(sql, params)
+                await db.commit()
+            return
+
+        await self._write_queue.put((sql, params))
+
+    async def flush(self):
+        """Ожидание фиксации всех поставленных ранее в очередь записей"""
+        if self._write_queue is None:
+            return
+
+        barrier = asyncio.get_running_loop().create_future()
+        await self._write_queue.put(barrier)
+        await barrier
+
+    async def _write_behind_loop(self):
+        """Фоновая задача: сбор записей из очереди и групповая фиксация"""
+        loop = asyncio.get_running_loop()
+        queue = self._write_queue
+        batch = []
+        stopping = False
+        try:
+            while not stopping:
+                item = await queue.get()
+                batch.append(item)
+                deadline = loop.time() + self.flush_interval
+
+                # Добираем пачку, пока не истек интервал или не набран лимит строк
+                while (item is not None and not isinstance(item, asyncio.Future)
+                       and len(batch) < self.flush_max_rows):
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    batch.append(item)
+
+                stopping = item is None
+                await self._commit_batch(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # При отмене задачи дописываем все, что уже попало в очередь
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._commit_batch(batch)
+            raise
+
+    async def _commit_batch(self, batch: list):
+        """Запись пачки одной транзакцией с группировкой одинаковых запросов"""
+        writes = [item for item in batch if isinstance(item, tuple)]
+        barriers = [item for item in batch if isinstance(item, asyncio.Future)]
+
+        if writes:
+            try:
+                async with self._writer() as db:
+                    for sql, group in groupby(writes, key=itemgetter(0)):
+                        await db.executemany(sql, [params for _, params in group])
+                    await db.commit()
+            except Exception as e:
+                logging.error(f"Ошибка групповой записи ({len(writes)} строк): {e}")
+                # Повторяем построчно, чтобы одна ошибочная строка не потеряла всю пачку
+                for sql, params in writes:
+                    try:
+                        async with self._writer() as db:
+                            await db.execute(sql, params)
+                            await db.commit()
+                    except Exception as e:
+                        logging.error(f"Ошибка записи в базу данных: {e}")
+
+        for barrier in barriers:
+            if not barrier.done():
+                barrier.set_result(None)
+
+    async def create_tables(self):
+        """Создание необходимых таблиц и применение миграций схемы"""
+        async with self._writer() as db:
+            await apply_migrations(db)
+    
+    async def add_user(self, user_id: int, username: str = None):
+        """Добавление нового пользователя"""
+        await self._write(
+            "INSERT OR IGNORE INTO users (user_id, username) VALUES (?, ?)",
+            (user_id, username)
+        )
+    
+    async def save_workout(self, user_id: int, workout_type: str, duration: int,
+                          calories_burned: int, exercises_completed: int):
+        """Сохранение информации о завершенной тренировке"""
+        await self._write(
+            """
+            INSERT INTO workouts 
+            (user_id, workout_type, duration, calories_burned, exercises_completed)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (user_id, workout_type, duration, calories_burned, exercises_completed)
+        )
+    
+    async def record_weight(self, user_id: int, weight: float):
+        """Запись веса пользователя"""
+        await self._write(
+            "INSERT INTO weight_records (user_id, weight) VALUES (?, ?)",
+            (user_id, weight)
+        )
+        # Новая запись становится последней, поэтому сразу обновляем кэш
+        self._cache_latest_weight(user_id, weight)
+    
+    async def record_measurements(self, user_id: int, chest: float, waist: float,
+                                hips: float, biceps: float, thighs: float):
+        """Запись измерений тела"""
+        await self._write(
+            """
+            INSERT INTO measurements 
+            (user_id, chest, waist, hips, biceps, thighs)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (user_id, chest, waist, hips, biceps, thighs)
+        )
+    
+    async def add_meal_entry(self, user_id: int, meal_name: str, calories: float,
+                             proteins: float, fats: float, carbs: float):
+        """Запись приема пищи в дневник питания"""
+        await self._write(
+            """
+            INSERT INTO meal_diary (user_id, meal_name, calories, proteins, fats, carbs)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (user_id, meal_name, calories, proteins, fats, carbs)
+        )
+    
+    async def get_user_statistics(self, user_id: int) -> tuple:
+        """Получение общей статистики пользователя"""
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT total_workouts, total_duration, total_calories, total_exercises
+                FROM user_workout_totals
+                WHERE user_id = ?
+                """,
+                (user_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        # Без тренировок возвращаем то же, что и агрегат по пустой выборке
+        return row or (0, None, None, None)
+    
+    async def rebuild_workout_totals(self) -> int:
+        """Пересчет сводных итогов тренировок по всей истории"""
+        await self.flush()
+        async with self._writer() as db:
+            await db.execute("DELETE FROM user_workout_totals")
+            cursor = await db.execute(
+                """
+                INSERT INTO user_workout_totals
+                SELECT user_id, COUNT(*), COALESCE(SUM(duration), 0),
+                       COALESCE(SUM(calories_burned), 0),
+                       COALESCE(SUM(exercises_completed), 0), MAX(completed_at)
+                FROM workouts
+                GROUP BY user_id
+                """
+            )
+            await db.commit()
+            return cursor.rowcount
+    
+    async def export_rows(self, table: str, batch_rows: int = 5000):
+        """Чтение всех строк таблицы пачками: (список колонок, строки)"""
+        async with self._reader() as db:
+            async with db.execute(f"SELECT * FROM {table}") as cursor:
+                columns = [column[0] for column in cursor.description]
+                while True:
+                    rows = await cursor.fetchmany(batch_rows)
+                    if not rows:
+                        break
+                    yield columns, rows
+    
+    async def import_rows(self, table: str, columns: list, rows: list) -> int:
+        """Массовая вставка строк одной транзакцией (перенос данных между базами)"""
+        placeholders = ", ".join("?" for _ in columns)
+        async with self._writer() as db:
+            cursor = await db.executemany(
+                f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+            await db.commit()
+            return cursor.rowcount
+    
+    def _cache_latest_weight(self, user_id: int, weight):
+        """Сохранение последнего веса в кэше с вытеснением давних записей"""
+        self._latest_weight[user_id] = weight
+        self._latest_weight.move_to_end(user_id)
+        if len(self._latest_weight) > WEIGHT_CACHE_SIZE:
+            self._latest_weight.popitem(last=False)
+    
+    async def get_latest_weight(self, user_id: int):
+        """Получение последнего записанного веса пользователя"""
+        weight = self._latest_weight.get(user_id, _MISSING)
+        if weight is not _MISSING:
+            self._latest_weight.move_to_end(user_id)
+            return weight
+
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT weight
+                FROM weight_records
+                WHERE user_id = ?
+                ORDER BY recorded_at DESC, id DESC
+                LIMIT 1
+                """,
+                (user_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+
+        # Пока шел запрос, record_weight мог записать более свежее значение
+        if user_id in self._latest_weight:
+            return self._latest_weight[user_id]
+
+        weight = row[0] if row else None
+        self._cache_latest_weight(user_id, weight)
+        return weight
+    
+    async def get_weight_history(self, user_id: int) -> list:
+        """Получение истории изменения веса"""
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT weight, recorded_at
+                FROM weight_records
+                WHERE user_id = ?
+                ORDER BY recorded_at DESC, id DESC
+                LIMIT 10
+                """,
+                (user_id,)
+            ) as cursor:
+                return await cursor.fetchall()
+    
+    async def get_measurements_history(self, user_id: int) -> list:
+        """Получение истории измерений"""
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT chest, waist, hips, biceps, thighs, recorded_at
+                FROM measurements
+                WHERE user_id = ?
+                ORDER BY recorded_at DESC
+                LIMIT 5
+                """,
+                (user_id,)
+            ) as cursor:
+                return await cursor.fetchall()
+    
+    async def get_recent_workouts(self, user_id: int, limit: int = 5) -> list:
+        """Получение последних тренировок пользователя"""
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT workout_type, duration, calories_burned, completed_at
+                FROM workouts
+                WHERE user_id = ?
+                ORDER BY completed_at DESC
+                LIMIT ?
+                """,
+                (user_id, limit)
+            ) as cursor:
+                return await cursor.fetchall()
+    
+    async def save_workout_reminder(self, user_id: int, minute_of_day: int, days_mask: int):
+        """Сохранение напоминания о тренировках"""
+        async with self._writer() as db:
+            # У пользователя одна строка напоминаний, новое расписание заменяет прежнее
+            await db.execute(
+                """
+                INSERT INTO workout_reminders (user_id, minute_of_day, days_mask)
+                VALUES (?, ?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    minute_of_day = excluded.minute_of_day,
+                    days_mask = excluded.days_mask,
+                    is_active = TRUE,
+                    created_at = excluded.created_at,
+                    next_fire_at = NULL
+                """,
+                (user_id, minute_of_day, days_mask)
+            )
+            await db.commit()
+    
+    async def save_meal_reminder(self, user_id: int, meal_count: int, meal_minutes: list):
+        """Сохранение напоминания о питании"""
+        async with self._writer() as db:
+            await db.execute(
+                """
+                INSERT INTO meal_reminders (user_id, meal_count, meal_minutes)
+                VALUES (?, ?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    meal_count = excluded.meal_count,
+                    meal_minutes = excluded.meal_minutes,
+                    is_active = TRUE,
+                    created_at = excluded.created_at,
+                    next_fire_at = NULL
+                """,
+                (user_id, meal_count, pack_minutes(meal_minutes))
+            )
+            await db.commit()
+    
+    async def get_workout_reminders(self, user_id: int) -> tuple:
+        """Получение напоминаний о тренировках"""
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT minute_of_day, days_mask
+                FROM workout_reminders
+                WHERE user_id = ? AND is_active = TRUE
+                """,
+                (user_id,)
+            ) as cursor:
+                return await cursor.fetchone()
+    
+    async def get_meal_reminders(self, user_id: int) -> tuple:
+        """Получение напоминаний о питании"""
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT meal_count, meal_minutes
+                FROM meal_reminders
+                WHERE user_id = ? AND is_active = TRUE
+                """,
+                (user_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return (row[0], unpack_minutes(row[1])) if row else None
+    
+    async def get_due_reminders(self, since, until: int) -> list:
+        """Активные напоминания с моментом срабатывания в [since, until):
+        (тип, user_id, минуты от начала суток, маска дней, часовой пояс, next_fire_at).
+        При since=None возвращаются и еще не запланированные напоминания"""
+        if since is None:
+            condition = "(r.next_fire_at IS NULL OR r.next_fire_at < ?)"
+            params = (until,)
+        else:
+            condition = "r.next_fire_at >= ? AND r.next_fire_at < ?"
+            params = (since, until)
+
+        async with self._reader() as db:
+            async with db.execute(
+                f"""
+                SELECT 'workout', r.user_id, r.minute_of_day, r.days_mask, u.timezone,
+                       r.next_fire_at
+                FROM workout_reminders AS r
+                LEFT JOIN users AS u ON u.user_id = r.user_id
+                WHERE r.is_active = TRUE AND {condition}
+                UNION ALL
+                SELECT 'meal', r.user_id, r.meal_minutes, {ALL_DAYS_MASK}, u.timezone,
+                       r.next_fire_at
+                FROM meal_reminders AS r
+                LEFT JOIN users AS u ON u.user_id = r.user_id
+                WHERE r.is_active = TRUE AND {condition}
+                """,
+                params * 2
+            ) as cursor:
+                return [
+                    (kind, user_id,
+                     (minutes,) if kind == "workout" else unpack_minutes(minutes),
+                     days_mask, timezone, next_fire_at)
+                    for kind, user_id, minutes, days_mask, timezone, next_fire_at
+                    in await cursor.fetchall()
+                ]
+    
+    async def update_next_fire_times(self, updates: list):
+        """Сохранение следующих моментов срабатывания: [(тип, user_id, next_fire_at)]"""
+        if not updates:
+            return
+        async with self._writer() as db:
+            for kind, rows in groupby(sorted(updates, key=itemgetter(0)), key=itemgetter(0)):
+                await db.executemany(
+                    f"""
+                    UPDATE {REMINDER_TABLES[kind]} SET next_fire_at = ?
+                    WHERE user_id = ?
+                    """,
+                    [(next_fire_at, user_id) for _, user_id, next_fire_at in rows]
+                )
+            await db.commit()
+    
+    async def record_deliveries(self, deliveries: list):
+        """Запись доставленных напоминаний вместе с переходом к следующему срабатыванию:
+        [(тип, user_id, слот, next_fire_at)]"""
+        if not deliveries:
+            return
+        async with self._writer() as db:
+            await db.executemany(
+                """
+                INSERT OR IGNORE INTO reminder_deliveries (slot_epoch, user_id, reminder_id)
+                VALUES (?, ?, ?)
+                """,
+                [(slot, user_id, REMINDER_IDS[kind]) for kind, user_id, slot, _ in deliveries]
+            )
+            # Момент срабатывания сдвигается, только если расписание не менялось
+            # после отправки (next_fire_at все еще равен доставленному слоту)
+            for kind, rows in groupby(sorted(deliveries, key=itemgetter(0)), key=itemgetter(0)):
+                await db.executemany(
+                    f"""
+                    UPDATE {REMINDER_TABLES[kind]} SET next_fire_at = ?
+                    WHERE user_id = ? AND next_fire_at = ?
+                    """,
+                    [(next_fire_at, user_id, slot) for _, user_id, slot, next_fire_at in rows]
+                )
+            await db.commit()
+    
+    async def get_delivered_slots(self, since: int) -> set:
+        """Доставленные напоминания со слотом не раньше since: {(тип, user_id, слот)}"""
+        kinds = {reminder_id: kind for kind, reminder_id in REMINDER_IDS.items()}
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT reminder_id, user_id, slot_epoch
+                FROM reminder_deliveries
+                WHERE slot_epoch >= ?
+                """,
+                (since,)
+            ) as cursor:
+                return {(kinds[reminder_id], user_id, slot)
+                        for reminder_id, user_id, slot in await cursor.fetchall()}
+    
+    async def prune_deliveries(self, before: int) -> int:
+        """Удаление записей журнала доставки со слотом раньше before"""
+        async with self._writer() as db:
+            cursor = await db.execute(
+                "DELETE FROM reminder_deliveries WHERE slot_epoch < ?", (before,)
+            )
+            await db.commit()
+            return cursor.rowcount
+    
+    async def save_workout_sessions(self, changes: list):
+        """Запись изменений незавершенных тренировок одной транзакцией:
+        [(user_id, состояние)]; состояние None удаляет сессию"""
+        if not changes:
+            return
+        async with self._writer() as db:
+            await db.executemany(
+                """
+                INSERT INTO workout_sessions
+                (user_id, workout_type_id, current_exercise, completed_exercises,
+                 started_at, last_activity)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    workout_type_id = excluded.workout_type_id,
+                    current_exercise = excluded.current_exercise,
+                    completed_exercises = excluded.completed_exercises,
+                    started_at = excluded.started_at,
+                    last_activity = excluded.last_activity
+                """,
+                [(user_id, *state) for user_id, state in changes if state is not None]
+            )
+            await db.executemany(
+                "DELETE FROM workout_sessions WHERE user_id = ?",
+                [(user_id,) for user_id, state in changes if state is None]
+            )
+            await db.commit()
+    
+    async def get_workout_session(self, user_id: int):
+        """Сохраненное состояние незавершенной тренировки или None"""
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT workout_type_id, current_exercise, completed_exercises,
+                       started_at, last_activity
+                FROM workout_sessions
+                WHERE user_id = ?
+                """,
+                (user_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return tuple(row) if row else None
+    
+    async def take_stale_workout_sessions(self, before: int) -> list:
+        """Удаление и возврат тренировок без активности с момента before:
+        [(user_id, состояние)]"""
+        async with self._writer() as db:
+            async with db.execute(
+                """
+                DELETE FROM workout_sessions
+                WHERE last_activity < ?
+                RETURNING user_id, workout_type_id, current_exercise, completed_exercises,
+                          started_at, last_activity
+                """,
+                (before,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+            await db.commit()
+            return [(row[0], tuple(row[1:])) for row in rows]
+    
+    async def get_user_timezone(self, user_id: int):
+        """Получение часового пояса пользователя (None - пояс по умолчанию)"""
+        async with self._reader() as db:
+            async with db.execute(
+                "SELECT timezone FROM users WHERE user_id = ?", (user_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return row[0] if row else None
+    
+    async def set_user_timezone(self, user_id: int, timezone: str):
+        """Сохранение часового пояса пользователя"""
+        await self._write(
+            """
+            INSERT INTO users (user_id, timezone) VALUES (?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET timezone = excluded.timezone
+            """,
+            (user_id, timezone)
+        )
+    
+    async def get_media_file_ids(self) -> dict:
+        """Все сохраненные file_id картинок: {адрес: file_id}"""
+        async with self._reader() as db:
+            async with db.execute("SELECT url, file_id FROM media_files") as cursor:
+                return dict(await cursor.fetchall())
+    
+    async def save_media_file_id(self, url: str, file_id: str):
+        """Сохранение file_id картинки, загруженной по адресу url"""
+        await self._write(
+            """
+            INSERT INTO media_files (url, file_id) VALUES (?, ?)
+            ON CONFLICT (url) DO UPDATE SET file_id = excluded.file_id
+            """,
+            (url, file_id)
+        )
+    
+    async def get_day_nutrition(self, user_id: int, day: date = None) -> tuple:
+        """Получение итогов питания и списка приемов пищи за день"""
+        day = day or datetime.now().date()
+        day_start, day_end = local_day_bounds(day)
+
+        async with self._reader() as db:
+            async with db.execute(
+                """
+                SELECT total_calories, total_proteins, total_fats, total_carbs, meals_count
+                FROM meal_diary_daily
+                WHERE user_id = ? AND day = ?
+                """,
+                (user_id, f"{day:%Y-%m-%d}")
+            ) as cursor:
+                totals = await cursor.fetchone()
+
+            if not totals:
+                return (0, 0, 0, 0, 0), []
+
+            async with db.execute(
+                """
+                SELECT meal_name, calories, proteins, fats, carbs, recorded_at
+                FROM meal_diary
+                WHERE user_id = ?
+                AND recorded_at >= ? AND recorded_at < ?
+                ORDER BY recorded_at
+                """,
+                (user_id, day_start, day_end)
+            ) as cursor:
+                meals = await cursor.fetchall()
+
+        return totals, meals
+
+# Таблицы с исходными данными пользователей, распределяемые по шардам.
+# Сводные таблицы заполняются в шардах триггерами при переносе строк.
+SHARDED_TABLES = (
+    "users", "workouts", "weight_records", "measurements",
+    "workout_reminders", "meal_reminders", "meal_diary", "reminder_deliveries",
+    "workout_sessions",
+)
+
+def shard_path(db_name: str, index: int) -> str:
+    """Путь к файлу шарда: fitness_bot.db -> fitness_bot.shard0.db"""
+    path = Path(db_name)
+    return str(path.with_name(f"{path.stem}.shard{index}{path.suffix}"))
+
+def shard_index(user_id: int, shards: int) -> int:
+    """Стабильный номер шарда пользователя, не зависящий от запуска процесса"""
+    return zlib.crc32(str(user_id).encode()) % shards
+
+class ShardedDatabase:
+    """База данных, распределяющая пользователей по нескольким файлам SQLite"""
+
+    def __init__(self, db_name: str = DB_PATH, shards: int = DB_SHARDS, **kwargs):
+        self.db_name = db_name
+        # У каждого шарда свой писатель, поэтому записи разных шардов не блокируют друг друга
+        self.shards = [Database(shard_path(db_name, index), **kwargs)
+                       for index in range(max(1, shards))]
+
+    def _shard(self, user_id: int) -> Database:
+        """Шард, в котором хранятся данные пользователя"""
+        return self.shards[shard_index(user_id, len(self.shards))]
+
+    async def open(self):
+        """Открытие всех шардов"""
+        await asyncio.gather(*(shard.open() for shard in self.shards))
+
+    async def close(self):
+        """Закрытие всех шардов с дозаписью очередей"""
+        await asyncio.gather(*(shard.close() for shard in self.shards))
+
+    async def create_tables(self):
+        """Применение миграций схемы во всех шардах"""
+        await asyncio.gather(*(shard.create_tables() for shard in self.shards))
+
+    async def flush(self):
+        """Ожидание фиксации отложенных записей во всех шардах"""
+        await asyncio.gather(*(shard.flush() for shard in self.shards))
+
+    def get_pool_metrics(self) -> dict:
+        """Метрики ожидания соединений по каждому шарду"""
+        return {shard.db_name: shard.get_pool_metrics() for shard in self.shards}
+
+    async def rebuild_workout_totals(self) -> int:
+        """Пересчет сводных итогов тренировок во всех шардах"""
+        counts = await asyncio.gather(*(shard.rebuild_workout_totals() for shard in self.shards))
+        return sum(counts)
+
+    async def export_rows(self, table: str, batch_rows: int = 5000):
+        """Чтение всех строк таблицы из всех шардов пачками"""
+        for shard in self.shards:
+            async for columns, rows in shard.export_rows(table, batch_rows):
+                yield columns, rows
+
+    async def import_rows(self, table: str, columns: list, rows: list) -> int:
+        """Массовая вставка строк с распределением по шардам пользователей"""
+        user_column = columns.index("user_id")
+        by_shard = defaultdict(list)
+        for row in rows:
+            by_shard[shard_index(row[user_column], len(self.shards))].append(row)
+
+        counts = await asyncio.gather(*(
+            self.shards[index].import_rows(table, columns, shard_rows)
+            for index, shard_rows in by_shard.items()
+        ))
+        return sum(counts)
+
+    async def add_user(self, user_id: int, username: str = None):
+        """Добавление нового пользователя"""
+        await self._shard(user_id).add_user(user_id, username)
+
+    async def save_workout(self, user_id: int, workout_type: str, duration: int,
+                          calories_burned: int, exercises_completed: int):
+        """Сохранение информации о завершенной тренировке"""
+        await self._shard(user_id).save_workout(
+            user_id, workout_type, duration, calories_burned, exercises_completed
+        )
+
+    async def record_weight(self, user_id: int, weight: float):
+        """Запись веса пользователя"""
+        await self._shard(user_id).record_weight(user_id, weight)
+
+    async def record_measurements(self, user_id: int, chest: float, waist: float,
+                                hips: float, biceps: float, thighs: float):
+        """Запись измерений тела"""
+        await self._shard(user_id).record_measurements(user_id, chest, waist, hips, biceps, thighs)
+
+    async def add_meal_entry(self, user_id: int, meal_name: str, calories: float,
+                             proteins: float, fats: float, carbs: float):
+        """Запись приема пищи в дневник питания"""
+        await self._shard(user_id).add_meal_entry(user_id, meal_name, calories, proteins, fats, carbs)
+
+    async def get_user_statistics(self, user_id: int) -> tuple:
+        """Получение общей статистики пользователя"""
+        return await self._shard(user_id).get_user_statistics(user_id)
+
+    async def get_latest_weight(self, user_id: int):
+        """Получение последнего записанного веса пользователя"""
+        return await self._shard(user_id).get_latest_weight(user_id)
+
+    async def get_weight_history(self, user_id: int) -> list:
+        """Получение истории изменения веса"""
+        return await self._shard(user_id).get_weight_history(user_id)
+
+    async def get_measurements_history(self, user_id: int) -> list:
+        """Получение истории измерений"""
+        return await self._shard(user_id).get_measurements_history(user_id)
+
+    async def get_recent_workouts(self, user_id: int, limit: int = 5) -> list:
+        """Получение последних тренировок пользователя"""
+        return await self._shard(user_id).get_recent_workouts(user_id, limit)
+
+    async def save_workout_reminder(self, user_id: int, minute_of_day: int, days_mask: int):
+        """Сохранение напоминания о тренировках"""
+        await self._shard(user_id).save_workout_reminder(user_id, minute_of_day, days_mask)
+
+    async def save_meal_reminder(self, user_id: int, meal_count: int, meal_minutes: list):
+        """Сохранение напоминания о питании"""
+        await self._shard(user_id).save_meal_reminder(user_id, meal_count, meal_minutes)
+
+    async def get_workout_reminders(self, user_id: int) -> tuple:
+        """Получение напоминаний о тренировках"""
+        return await self._shard(user_id).get_workout_reminders(user_id)
+
+    async def get_meal_reminders(self, user_id: int) -> tuple:
+        """Получение напоминаний о питании"""
+        return await self._shard(user_id).get_meal_reminders(user_id)
+
+    async def get_due_reminders(self, since, until: int) -> list:
+        """Активные напоминания с моментом срабатывания в [since, until) из всех шардов"""
+        results = await asyncio.gather(*(shard.get_due_reminders(since, until)
+                                         for shard in self.shards))
+        return [row for rows in results for row in rows]
+
+    async def update_next_fire_times(self, updates: list):
+        """Сохранение следующих моментов срабатывания с распределением по шардам"""
+        by_shard = defaultdict(list)
+        for update in updates:
+            by_shard[shard_index(update[1], len(self.shards))].append(update)
+        await asyncio.gather(*(self.shards[index].update_next_fire_times(shard_updates)
+                               for index, shard_updates in by_shard.items()))
+
+    async def record_deliveries(self, deliveries: list):
+        """Запись доставленных напоминаний с распределением по шардам"""
+        by_shard = defaultdict(list)
+        for delivery in deliveries:
+            by_shard[shard_index(delivery[1], len(self.shards))].append(delivery)
+        await asyncio.gather(*(self.shards[index].record_deliveries(shard_deliveries)
+                               for index, shard_deliveries in by_shard.items()))
+
+    async def get_delivered_slots(self, since: int) -> set:
+        """Доставленные напоминания со слотом не раньше since из всех шардов"""
+        results = await asyncio.gather(*(shard.get_delivered_slots(since) for shard in self.shards))
+        return set().union(*results)
+
+    async def prune_deliveries(self, before: int) -> int:
+        """Удаление старых записей журнала доставки во всех шардах"""
+        counts = await asyncio.gather(*(shard.prune_deliveries(before) for shard in self.shards))
+        return sum(counts)
+
+    async def save_workout_sessions(self, changes: list):
+        """Запись изменений незавершенных тренировок с распределением по шардам"""
+        by_shard = defaultdict(list)
+        for change in changes:
+            by_shard[shard_index(change[0], len(self.shards))].append(change)
+        await asyncio.gather(*(self.shards[index].save_workout_sessions(shard_changes)
+                               for index, shard_changes in by_shard.items()))
+
+    async def get_workout_session(self, user_id: int):
+        """Сохраненное состояние незавершенной тренировки или None"""
+        return await self._shard(user_id).get_workout_session(user_id)
+
+    async def take_stale_workout_sessions(self, before: int) -> list:
+        """Удаление и возврат заброшенных тренировок из всех шардов"""
+        results = await asyncio.gather(*(shard.take_stale_workout_sessions(before)
+                                         for shard in self.shards))
+        return [row for rows in results for row in rows]
+
+    async def get_user_timezone(self, user_id: int):
+        """Получение часового пояса пользователя (None - пояс по умолчанию)"""
+        return await self._shard(user_id).get_user_timezone(user_id)
+
+    async def set_user_timezone(self, user_id: int, timezone: str):
+        """Сохранение часового пояса пользователя"""
+        await self._shard(user_id).set_user_timezone(user_id, timezone)
+
+    async def get_media_file_ids(self) -> dict:
+        """Все сохраненные file_id картинок; общие данные живут в нулевом шарде"""
+        return await self.shards[0].get_media_file_ids()
+
+    async def save_media_file_id(self, url: str, file_id: str):
+        """Сохранение file_id картинки в нулевом шарде"""
+        await self.shards[0].save_media_file_id(url, file_id)
+
+    async def get_day_nutrition(self, user_id: int, day: date = None) -> tuple:
+        """Получение итогов питания и списка приемов пищи за день"""
+        return await self._shard(user_id).get_day_nutrition(user_id, day)
+
+def create_database(db_name: str = DB_PATH, shards: int = DB_SHARDS, **kwargs):
+    """Создание базы данных: одного файла или набора шардов"""
+    if shards > 1:
+        return ShardedDatabase(db_name, shards, **kwargs)
+    return Database(db_name, **kwargs)
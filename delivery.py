@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+
+from aiogram.exceptions import (
+    TelegramForbiddenError, TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+)
+
+from config import SEND_RATE_LIMIT, SEND_CHAT_INTERVAL_MS, SEND_WORKERS, SEND_QUEUE_SIZE
+
+# Сколько раз повторять отправку после временной ошибки
+SEND_MAX_ATTEMPTS = 3
+
+class TokenBucket:
+    """Ограничитель частоты: не более rate событий в секунду со всплеском до burst"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float):
+        """Приостановка выдачи (например, по retry_after от Telegram)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """Ожидание разрешения на одно событие"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        # Токен резервируется сразу (баланс может уйти в минус),
+        # поэтому параллельные ожидающие получают разрешения строго по очереди
+        self._tokens -= 1
+        delay = max(-self._tokens / self.rate, self._paused_until - now)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class DeliveryQueue:
+    """Очередь исходящих сообщений с ограничением частоты отправки"""
+
+    def __init__(self, bot, rate: float = SEND_RATE_LIMIT,
+                 chat_interval_ms: int = SEND_CHAT_INTERVAL_MS,
+                 workers: int = SEND_WORKERS, maxsize: int = SEND_QUEUE_SIZE):
+        self.bot = bot
+        self.chat_interval = chat_interval_ms / 1000
+        self.workers = max(1, workers)
+        self._queue = asyncio.Queue(maxsize)
+        # Общий лимит бота и время, раньше которого нельзя писать в конкретный чат
+        self._bucket = TokenBucket(rate, burst=max(1, int(rate)))
+        self._chat_ready_at = {}
+        self._tasks = []
+        self.sent = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        """Запуск обработчиков очереди"""
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Остановка обработчиков; неотправленные сообщения отбрасываются"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._queue.qsize():
+            logging.info(f"Не отправлено сообщений при остановке: {self._queue.qsize()}")
+
+    def enqueue(self, chat_id: int, text: str, on_done=None, **kwargs) -> bool:
+        """Постановка сообщения в очередь без ожидания.
+        on_done вызывается, когда сообщение отправлено или окончательно отброшено"""
+        return self._put((chat_id, text, kwargs, 0, on_done))
+
+    def _put(self, item: tuple) -> bool:
+        """Добавление в очередь; при переполнении сообщение отбрасывается"""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            logging.error(f"Очередь отправки переполнена, сообщение для {item[0]} отброшено")
+            self._drop(item)
+            return False
+
+    def _drop(self, item: tuple):
+        """Учет окончательно неотправленного сообщения"""
+        self.dropped += 1
+        self._done(item)
+
+    def _done(self, item: tuple):
+        """Уведомление отправителя о завершении обработки сообщения"""
+        on_done = item[4]
+        if on_done:
+            try:
+                on_done()
+            except Exception as e:
+                logging.error(f"Ошибка в обработчике завершения отправки: {e}")
+
+    def _retry_later(self, item: tuple, delay: float):
+        """Повторная постановка в очередь через delay секунд, не занимая обработчик"""
+        asyncio.get_running_loop().call_later(delay, self._put, item)
+
+    def _chat_delay(self, chat_id: int) -> float:
+        """Сколько осталось ждать до следующего сообщения в чат"""
+        now = time.monotonic()
+        ready_at = self._chat_ready_at.get(chat_id, 0.0)
+        if ready_at > now:
+            return ready_at - now
+        self._chat_ready_at[chat_id] = now + self.chat_interval
+
+        # Периодически забываем чаты, лимит которых уже истек
+        if len(self._chat_ready_at) > 10000:
+            self._chat_ready_at = {chat: ready for chat, ready in self._chat_ready_at.items()
+                                   if ready > now}
+        return 0.0
+
+    async def _worker(self):
+        """Обработчик очереди: отправка с учетом лимитов"""
+        while True:
+            item = await self._queue.get()
+            try:
+                await self._deliver(item)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, item: tuple):
+        """Отправка одного сообщения с обработкой ограничений Telegram"""
+        chat_id, text, kwargs, attempts, on_done = item
+        delay = self._chat_delay(chat_id)
+        if delay:
+            self._retry_later(item, delay)
+            return
+
+        await self._bucket.acquire()
+        # Интервал чата отсчитывается от фактической отправки, а не от постановки в очередь
+        self._chat_ready_at[chat_id] = time.monotonic() + self.chat_interval
+        try:
+            await self.bot.send_message(chat_id, text, **kwargs)
+            self.sent += 1
+            self._done(item)
+        except TelegramRetryAfter as e:
+            # Флуд-контроль: приостанавливаем все отправки и повторяем сообщение
+            logging.error(f"Превышен лимит отправки, пауза {e.retry_after} с")
+            self._bucket.pause(e.retry_after)
+            self._retry_later(item, e.retry_after)
+        except TelegramForbiddenError:
+            # Пользователь заблокировал бота - повторять бессмысленно
+            self._drop(item)
+        except (TelegramNetworkError, TelegramServerError) as e:
+            if attempts + 1 < SEND_MAX_ATTEMPTS:
+                self._retry_later((chat_id, text, kwargs, attempts + 1, on_done), 2 ** attempts)
+            else:
+                logging.error(f"Ошибка при отправке сообщения пользователю {chat_id}: {e}")
+                self._drop(item)
+        except Exception as e:
+            logging.error(f"Ошибка при отправке сообщения пользователю {chat_id}: {e}")
+            self._drop(item)
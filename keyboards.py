@@ -1,91 +1,228 @@
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
-from aiogram.utils.keyboard import InlineKeyboardBuilder
-from config import WORKOUT_TYPES
-from workout_manager import WorkoutSession
-
-def get_main_keyboard() -> InlineKeyboardMarkup:
-    """Создание главной клавиатуры"""
-    builder = InlineKeyboardBuilder()
-    
-    builder.add(InlineKeyboardButton(text="🏋️ Тренировки", callback_data="menu_workouts"))
-    builder.add(InlineKeyboardButton(text="📊 Прогресс", callback_data="menu_progress"))
-    builder.add(InlineKeyboardButton(text="🍳 Питание", callback_data="menu_nutrition"))
-    builder.add(InlineKeyboardButton(text="⏰ Напоминания", callback_data="menu_reminders"))
-    builder.add(InlineKeyboardButton(text="💡 Советы", callback_data="menu_tips"))
-    
-    builder.adjust(2)
-    return builder.as_markup()
-
-def get_workouts_keyboard() -> InlineKeyboardMarkup:
-    """Создание клавиатуры для выбора тренировки"""
-    builder = InlineKeyboardBuilder()
-    
-    for key, value in WORKOUT_TYPES.items():
-        builder.add(InlineKeyboardButton(text=value, callback_data=key))
-    
-    builder.add(InlineKeyboardButton(text="↩️ Назад", callback_data="back_to_main"))
-    builder.adjust(2, 1)
-    return builder.as_markup()
-
-def get_progress_keyboard() -> InlineKeyboardMarkup:
-    """Создание клавиатуры для раздела прогресса"""
-    builder = InlineKeyboardBuilder()
-    
-    builder.add(InlineKeyboardButton(text="⚖️ Записать вес", callback_data="record_weight"))
-    builder.add(InlineKeyboardButton(text="📏 Записать измерения", callback_data="record_measurements"))
-    builder.add(InlineKeyboardButton(text="📊 Показать статистику", callback_data="show_statistics"))
-    builder.add(InlineKeyboardButton(text="📈 Показать прогресс", callback_data="show_progress"))
-    builder.add(InlineKeyboardButton(text="↩️ Назад", callback_data="back_to_main"))
-    
-    builder.adjust(2, 2, 1)
-    return builder.as_markup()
-
-def get_nutrition_keyboard() -> InlineKeyboardMarkup:
-    """Создание клавиатуры для раздела питания"""
-    builder = InlineKeyboardBuilder()
-    
-    builder.add(InlineKeyboardButton(text="🥗 Рецепты", callback_data="nutrition_recipes"))
-    builder.add(InlineKeyboardButton(text="🔢 Калькулятор калорий", callback_data="nutrition_calculator"))
-    builder.add(InlineKeyboardButton(text="📝 Дневник питания", callback_data="nutrition_diary"))
-    builder.add(InlineKeyboardButton(text="↩️ Назад", callback_data="back_to_main"))
-    
-    builder.adjust(2, 1, 1)
-    return builder.as_markup()
-
-def get_reminders_keyboard() -> InlineKeyboardMarkup:
-    """Создание клавиатуры для раздела напоминаний"""
-    builder = InlineKeyboardBuilder()
-    
-    builder.add(InlineKeyboardButton(text="🏋️ Напоминания о тренировках", callback_data="workout_reminders"))
-    builder.add(InlineKeyboardButton(text="🍽 Напоминания о питании", callback_data="meal_reminders"))
-    builder.add(InlineKeyboardButton(text="⚙️ Настройки напоминаний", callback_data="reminder_settings"))
-    builder.add(InlineKeyboardButton(text="↩️ Назад", callback_data="back_to_main"))
-    
-    builder.adjust(1)
-    return builder.as_markup()
-
-def get_tips_keyboard() -> InlineKeyboardMarkup:
-    """Создание клавиатуры для раздела советов"""
-    builder = InlineKeyboardBuilder()
-    
-    builder.add(InlineKeyboardButton(text="🏋️ Советы по тренировкам", callback_data="tips_workout"))
-    builder.add(InlineKeyboardButton(text="🥗 Советы по питанию", callback_data="tips_nutrition"))
-    builder.add(InlineKeyboardButton(text="💪 Мотивация", callback_data="tips_motivation"))
-    builder.add(InlineKeyboardButton(text="↩️ Назад", callback_data="back_to_main"))
-    
-    builder.adjust(1)
-    return builder.as_markup()
-
-def get_exercise_keyboard(session: WorkoutSession) -> InlineKeyboardMarkup:
-    """Создание клавиатуры для управления тренировкой"""
-    builder = InlineKeyboardBuilder()
-    
-    if session.current_exercise > 0:
-        builder.add(InlineKeyboardButton(text="⬅️ Предыдущее", callback_data="prev_exercise"))
-    
-    if session.current_exercise < len(session.exercises) - 1:
-        builder.add(InlineKeyboardButton(text="➡️ Следующее", callback_data="next_exercise"))
-    
-    builder.add(InlineKeyboardButton(text="❌ Завершить", callback_data="end_workout"))
-    builder.adjust(2)
-    return builder.as_markup() 
\ No newline at end of file
+from types import MappingProxyType
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+from config import WORKOUT_TYPES, TIMEZONES, EXERCISES, RECIPES
+from schedules import WEEKDAY_NAMES, ALL_DAYS_MASK
+from workout_manager import WorkoutSession
+
+# Все клавиатуры бота неизменны, поэтому собираются один раз при импорте модуля,
+# а обработчики только выбирают готовую разметку. Объекты разметки aiogram
+# заморожены, словари реестра доступны только для чтения
+
+def _build(buttons: list, *sizes: int) -> InlineKeyboardMarkup:
+    """Сборка разметки из пар (текст, callback_data) с раскладкой по рядам"""
+    builder = InlineKeyboardBuilder()
+    for text, callback_data in buttons:
+        builder.add(InlineKeyboardButton(text=text, callback_data=callback_data))
+    builder.adjust(*sizes)
+    return builder.as_markup()
+
+MAIN_KEYBOARD = _build([
+    ("🏋️ Тренировки", "menu_workouts"),
+    ("📊 Прогресс", "menu_progress"),
+    ("🍳 Питание", "menu_nutrition"),
+    ("⏰ Напоминания", "menu_reminders"),
+    ("💡 Советы", "menu_tips"),
+], 2)
+
+WORKOUTS_KEYBOARD = _build(
+    [(value, key) for key, value in WORKOUT_TYPES.items()] + [("↩️ Назад", "back_to_main")],
+    2, 1
+)
+
+PROGRESS_KEYBOARD = _build([
+    ("⚖️ Записать вес", "record_weight"),
+    ("📏 Записать измерения", "record_measurements"),
+    ("📊 Показать статистику", "show_statistics"),
+    ("📈 Показать прогресс", "show_progress"),
+    ("↩️ Назад", "back_to_main"),
+], 2, 2, 1)
+
+NUTRITION_KEYBOARD = _build([
+    ("🥗 Рецепты", "nutrition_recipes"),
+    ("🔢 Калькулятор калорий", "nutrition_calculator"),
+    ("📝 Дневник питания", "nutrition_diary"),
+    ("↩️ Назад", "back_to_main"),
+], 2, 1, 1)
+
+REMINDERS_KEYBOARD = _build([
+    ("🏋️ Напоминания о тренировках", "workout_reminders"),
+    ("🍽 Напоминания о питании", "meal_reminders"),
+    ("⚙️ Настройки напоминаний", "reminder_settings"),
+    ("🌍 Часовой пояс", "reminder_timezone"),
+    ("↩️ Назад", "back_to_main"),
+], 1)
+
+TIMEZONE_KEYBOARD = _build(
+    [(title, f"timezone_{timezone}") for timezone, title in TIMEZONES.items()]
+    + [("↩️ Назад", "menu_reminders")],
+    2
+)
+
+TIPS_KEYBOARD = _build([
+    ("🏋️ Советы по тренировкам", "tips_workout"),
+    ("🥗 Советы по питанию", "tips_nutrition"),
+    ("💪 Мотивация", "tips_motivation"),
+    ("↩️ Назад", "back_to_main"),
+], 1)
+
+# Клавиатуры разделов главного меню по части callback_data после "menu_"
+MENU_KEYBOARDS = MappingProxyType({
+    "workouts": WORKOUTS_KEYBOARD,
+    "progress": PROGRESS_KEYBOARD,
+    "nutrition": NUTRITION_KEYBOARD,
+    "reminders": REMINDERS_KEYBOARD,
+    "tips": TIPS_KEYBOARD,
+})
+
+BACK_TO_MAIN_KEYBOARD = _build([("↩️ В главное меню", "back_to_main")], 1)
+
+BACK_TO_NUTRITION_KEYBOARD = _build([("↩️ Назад", "menu_nutrition")], 1)
+
+# Раздел рецептов
+
+RECIPE_CATEGORIES_KEYBOARD = _build([
+    ("🥗 Рецепты для похудения", "recipes_loss"),
+    ("🍖 Рецепты для набора массы", "recipes_gain"),
+    ("↩️ Назад", "menu_nutrition"),
+], 1)
+
+BACK_TO_RECIPE_CATEGORIES_KEYBOARD = _build([("↩️ Назад", "nutrition_recipes")], 1)
+
+# Список рецептов категории
+RECIPE_LIST_KEYBOARDS = MappingProxyType({
+    category: _build(
+        [(recipe['name'], f"recipe_{category}_{index}") for index, recipe in enumerate(recipes)]
+        + [("↩️ Назад", "nutrition_recipes")],
+        1
+    )
+    for category, recipes in RECIPES.items()
+})
+
+# Навигация под рецептом категории
+RECIPE_KEYBOARDS = MappingProxyType({
+    category: _build([
+        ("↩️ К списку рецептов", f"recipes_{category}"),
+        ("↩️ К категориям", "nutrition_recipes"),
+    ], 1)
+    for category in RECIPES
+})
+
+# Предложение записать вес перед расчетом порций рецепта категории
+RECIPE_WEIGHT_KEYBOARDS = MappingProxyType({
+    category: _build([
+        ("📊 Записать вес", "record_weight"),
+        ("↩️ Назад", f"recipes_{category}"),
+    ], 1)
+    for category in RECIPES
+})
+
+# Калькулятор калорий
+
+ACTIVITY_LEVELS = {
+    "minimal": "Минимальная активность (сидячая работа)",
+    "low": "Низкая активность (легкие тренировки 1-3 раза в неделю)",
+    "medium": "Средняя активность (умеренные тренировки 3-5 раз в неделю)",
+    "high": "Высокая активность (интенсивные тренировки 6-7 раз в неделю)",
+    "very_high": "Очень высокая активность (спортсмены)"
+}
+
+GENDER_KEYBOARD = _build([
+    ("Мужской", "gender_male"),
+    ("Женский", "gender_female"),
+], 2)
+
+ACTIVITY_KEYBOARD = _build(
+    [(title, f"activity_{key}") for key, title in ACTIVITY_LEVELS.items()],
+    1
+)
+
+# Дневник питания
+
+NUTRITION_DIARY_KEYBOARD = _build([
+    ("Записать прием пищи", "add_meal"),
+    ("Статистика за день", "show_day_stats"),
+    ("Назад", "menu_nutrition"),
+], 1)
+
+MEAL_SAVED_KEYBOARD = _build([
+    ("Записать еще", "add_meal"),
+    ("В меню питания", "menu_nutrition"),
+], 1)
+
+DAY_STATS_KEYBOARD = _build([
+    ("Записать прием пищи", "add_meal"),
+    ("Назад", "menu_nutrition"),
+], 1)
+
+BACK_TO_NUTRITION_PLAIN_KEYBOARD = _build([("Назад", "menu_nutrition")], 1)
+
+def _build_days_keyboard(days_mask: int) -> InlineKeyboardMarkup:
+    """Клавиатура выбора дней недели для маски.
+    Каждая кнопка дня несет маску, которая получится после нажатия на нее"""
+    buttons = [
+        (f"{'☑' if days_mask >> bit & 1 else '☐'} {day_name}", f"daymask_{days_mask ^ (1 << bit)}")
+        for bit, day_name in enumerate(WEEKDAY_NAMES)
+    ]
+    buttons.append(("✅ Подтвердить выбор", f"confirm_days_{days_mask}"))
+    return _build(buttons, 1)
+
+# Клавиатуры выбора дней для всех 128 масок
+DAYS_KEYBOARDS = tuple(_build_days_keyboard(days_mask) for days_mask in range(ALL_DAYS_MASK + 1))
+
+def _build_exercise_keyboard(position: int, total: int) -> InlineKeyboardMarkup:
+    """Клавиатура управления тренировкой на упражнении position из total"""
+    buttons = []
+    if position > 0:
+        buttons.append(("⬅️ Предыдущее", "prev_exercise"))
+    if position < total - 1:
+        buttons.append(("➡️ Следующее", "next_exercise"))
+    buttons.append(("❌ Завершить", "end_workout"))
+    return _build(buttons, 2)
+
+# Клавиатуры тренировки по (номер упражнения, число упражнений)
+EXERCISE_KEYBOARDS = MappingProxyType({
+    (position, total): _build_exercise_keyboard(position, total)
+    for total in {len(exercises) for exercises in EXERCISES.values()}
+    for position in range(total)
+})
+
+def get_main_keyboard() -> InlineKeyboardMarkup:
+    """Главная клавиатура"""
+    return MAIN_KEYBOARD
+
+def get_workouts_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура для выбора тренировки"""
+    return WORKOUTS_KEYBOARD
+
+def get_progress_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура для раздела прогресса"""
+    return PROGRESS_KEYBOARD
+
+def get_nutrition_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура для раздела питания"""
+    return NUTRITION_KEYBOARD
+
+def get_reminders_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура для раздела напоминаний"""
+    return REMINDERS_KEYBOARD
+
+def get_days_keyboard(days_mask: int = 0) -> InlineKeyboardMarkup:
+    """Клавиатура выбора дней недели для маски"""
+    return DAYS_KEYBOARDS[days_mask & ALL_DAYS_MASK]
+
+def get_timezone_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура для выбора часового пояса"""
+    return TIMEZONE_KEYBOARD
+
+def get_tips_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура для раздела советов"""
+    return TIPS_KEYBOARD
+
+def get_exercise_keyboard(session: WorkoutSession) -> InlineKeyboardMarkup:
+    """Клавиатура для управления тренировкой"""
+    key = (session.current_exercise, len(session.exercises))
+    keyboard = EXERCISE_KEYBOARDS.get(key)
+    # Программы фиксированы в config, собирать на лету почти никогда не нужно
+    return keyboard if keyboard is not None else _build_exercise_keyboard(*key)
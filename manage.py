@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from config import DB_PATH
+from database import Database, ShardedDatabase, SHARDED_TABLES, shard_path
+
+# Количество строк, переносимых за одну транзакцию при перешардировании
+RESHARD_BATCH_ROWS = 5000
+
+async def backfill_totals(db_path: str):
+    """Заполнение сводных итогов тренировок для существующей базы"""
+    db = Database(db_path, readers=1, write_behind=False)
+    await db.open()
+    try:
+        await db.create_tables()
+        users = await db.rebuild_workout_totals()
+        logging.info(f"Итоги тренировок пересчитаны для {users} пользователей")
+    finally:
+        await db.close()
+
+async def reshard(db_path: str, shards: int):
+    """Перенос однофайловой базы в набор шардов (бот должен быть остановлен)"""
+    existing = [shard_path(db_path, index) for index in range(shards)
+                if Path(shard_path(db_path, index)).exists()]
+    if existing:
+        raise SystemExit(f"Файлы шардов уже существуют: {', '.join(existing)}")
+
+    source = Database(db_path, readers=1, write_behind=False)
+    target = ShardedDatabase(db_path, shards, readers=1, write_behind=False)
+    await source.open()
+    await target.open()
+    try:
+        # Приводим исходную базу и шарды к одной версии схемы
+        await source.create_tables()
+        await target.create_tables()
+
+        for table in SHARDED_TABLES:
+            copied = 0
+            async for columns, rows in source.export_rows(table, RESHARD_BATCH_ROWS):
+                await target.import_rows(table, columns, rows)
+                copied += len(rows)
+            logging.info(f"Таблица {table}: перенесено строк {copied}")
+    finally:
+        await target.close()
+        await source.close()
+
+def main():
+    """Служебные команды обслуживания базы данных"""
+    parser = argparse.ArgumentParser(description="Обслуживание базы данных фитнес-бота")
+    parser.add_argument("--db", default=DB_PATH, help="Путь к файлу базы данных")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("backfill-totals", help="Пересчитать сводные итоги тренировок")
+
+    reshard_parser = commands.add_parser("reshard", help="Разделить базу на файлы-шарды")
+    reshard_parser.add_argument("--shards", type=int, required=True, help="Количество шардов")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "backfill-totals":
+        asyncio.run(backfill_totals(args.db))
+    elif args.command == "reshard":
+        asyncio.run(reshard(args.db, args.shards))
+
+if __name__ == "__main__":
+    main()
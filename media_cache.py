@@ -0,0 +1,127 @@
+import asyncio
+import logging
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import InputMediaPhoto, Message
+
+from config import EXERCISES, RECIPES, WELCOME_PHOTO_URL, MEDIA_WARMUP_CHAT_ID
+from responses import replace_message
+
+# Пауза между загрузками при прогреве, чтобы не упираться в лимиты Telegram
+WARMUP_DELAY = 1
+
+def media_urls() -> list:
+    """Адреса всех картинок бота: главное меню, упражнения, рецепты"""
+    urls = [WELCOME_PHOTO_URL]
+    urls += [exercise["photo_url"] for exercises in EXERCISES.values() for exercise in exercises]
+    urls += [recipe["photo_url"] for recipes in RECIPES.values() for recipe in recipes]
+    return list(dict.fromkeys(urls))
+
+class MediaCache:
+    """Кэш file_id картинок, уже загруженных в Telegram.
+
+    Картинка по адресу загружается в Telegram один раз: file_id из ответа
+    сохраняется в таблице media_files и в словаре в памяти, и все следующие
+    отправки идут по file_id без повторного скачивания с исходного адреса"""
+
+    def __init__(self, db):
+        self.db = db
+        self._file_ids = {}
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._file_ids)
+
+    async def load(self):
+        """Чтение сохраненных file_id из базы"""
+        self._file_ids = await self.db.get_media_file_ids()
+        logging.info(f"Загружено file_id картинок: {len(self._file_ids)}")
+
+    def photo(self, url: str) -> str:
+        """file_id картинки, если она уже загружена, иначе ее адрес"""
+        return self._file_ids.get(url, url)
+
+    async def remember(self, url: str, message):
+        """Сохранение file_id из отправленного сообщения с картинкой"""
+        if not message or not message.photo:
+            return
+        # Самый крупный размер идет последним
+        file_id = message.photo[-1].file_id
+        if self._file_ids.get(url) == file_id:
+            return
+        self._file_ids[url] = file_id
+        try:
+            await self.db.save_media_file_id(url, file_id)
+        except Exception as e:
+            logging.error(f"Ошибка при сохранении file_id картинки {url}: {e}")
+
+    async def answer_photo(self, message, url: str, **kwargs):
+        """Ответ картинкой по кэшированному file_id с запоминанием нового"""
+        file_id = self._file_ids.get(url)
+        if file_id:
+            try:
+                return await message.answer_photo(photo=file_id, **kwargs)
+            except TelegramBadRequest as e:
+                # file_id перестал действовать - загружаем по адресу заново
+                logging.error(f"Недействительный file_id картинки {url}: {e}")
+                self._file_ids.pop(url, None)
+        sent = await message.answer_photo(photo=url, **kwargs)
+        await self.remember(url, sent)
+        return sent
+
+    async def show_photo(self, message, url: str, caption: str, reply_markup=None):
+        """Показ картинки с подписью и клавиатурой на месте сообщения.
+        Сообщение с картинкой меняется одним вызовом edit_message_media;
+        удаление и новая отправка - только если правка невозможна"""
+        if message.photo:
+            try:
+                edited = await message.edit_media(
+                    InputMediaPhoto(media=self.photo(url), caption=caption),
+                    reply_markup=reply_markup
+                )
+                if isinstance(edited, Message):
+                    await self.remember(url, edited)
+                return edited
+            except TelegramBadRequest as e:
+                # Повторное нажатие той же кнопки - на экране уже нужная картинка
+                if "message is not modified" in str(e):
+                    return None
+                logging.error(f"Ошибка при замене картинки в сообщении: {e}")
+
+        return await replace_message(
+            message, self.answer_photo(message, url, caption=caption, reply_markup=reply_markup)
+        )
+
+    def start_warmup(self, bot, chat_id: int = MEDIA_WARMUP_CHAT_ID):
+        """Фоновая загрузка еще не кэшированных картинок в служебный чат"""
+        if not chat_id:
+            return
+        self._task = asyncio.create_task(self._warmup(bot, chat_id))
+
+    async def stop(self):
+        """Остановка прогрева"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _warmup(self, bot, chat_id: int):
+        """Загрузка картинок по одной; отправленные сообщения сразу удаляются"""
+        warmed = 0
+        for url in media_urls():
+            if url in self._file_ids:
+                continue
+            try:
+                sent = await bot.send_photo(chat_id, url, disable_notification=True)
+                await self.remember(url, sent)
+                warmed += 1
+                await bot.delete_message(chat_id, sent.message_id)
+            except TelegramRetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                logging.error(f"Ошибка при загрузке картинки {url}: {e}")
+            await asyncio.sleep(WARMUP_DELAY)
+        logging.info(f"Прогрев кэша картинок завершен, загружено: {warmed}")
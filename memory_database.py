@@ -0,0 +1,382 @@
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from itertools import count
+
+from database import REMINDER_IDS, REMINDER_TABLES, local_day_bounds
+from schedules import ALL_DAYS_MASK, pack_minutes, unpack_minutes
+
+# Колонки таблиц в том же порядке, что и в схеме SQLite
+TABLE_COLUMNS = {
+    "users": ("user_id", "username", "registered_at", "timezone"),
+    "workouts": ("id", "user_id", "workout_type", "duration", "calories_burned",
+                 "exercises_completed", "completed_at"),
+    "weight_records": ("id", "user_id", "weight", "recorded_at"),
+    "measurements": ("id", "user_id", "chest", "waist", "hips", "biceps", "thighs",
+                     "recorded_at"),
+    "workout_reminders": ("user_id", "minute_of_day", "days_mask", "is_active",
+                          "created_at", "next_fire_at"),
+    "meal_reminders": ("user_id", "meal_count", "meal_minutes", "is_active",
+                       "created_at", "next_fire_at"),
+    "meal_diary": ("id", "user_id", "meal_name", "calories", "proteins", "fats", "carbs",
+                   "recorded_at"),
+    "reminder_deliveries": ("slot_epoch", "user_id", "reminder_id"),
+    "workout_sessions": ("user_id", "workout_type_id", "current_exercise",
+                         "completed_exercises", "started_at", "last_activity"),
+}
+
+# Поле времени, по которому упорядочены строки пользователя
+TIME_COLUMNS = {
+    "workouts": "completed_at",
+    "weight_records": "recorded_at",
+    "measurements": "recorded_at",
+    "meal_diary": "recorded_at",
+}
+
+# Таблицы с одной строкой на пользователя (первичный ключ user_id)
+USER_KEYED_TABLES = ("users", "workout_reminders", "meal_reminders", "workout_sessions")
+
+def _timestamp() -> int:
+    """Текущее время в секундах эпохи, как значение по умолчанию в SQLite"""
+    return int(time.time())
+
+class MemoryDatabase:
+    """Хранилище в памяти процесса для тестов и замеров без дискового ввода-вывода"""
+
+    def __init__(self):
+        # Строки таблиц в виде словарей: единственная строка пользователя
+        # или список строк в порядке записи (совпадает с порядком по времени)
+        self._keyed = {table: {} for table in USER_KEYED_TABLES}
+        self._users = self._keyed["users"]
+        self._rows = {table: defaultdict(list) for table in TIME_COLUMNS}
+        self._ids = {table: count(1) for table in TIME_COLUMNS}
+        self._known_ids = {table: set() for table in TIME_COLUMNS}
+
+        # Аналоги сводных таблиц, которые в SQLite ведут триггеры
+        self._workout_totals = {}
+        self._meal_daily = {}
+
+        # Журнал доставки напоминаний: множество (слот, user_id, номер типа)
+        self._deliveries = set()
+
+        # file_id загруженных картинок по адресу
+        self._media_files = {}
+
+    async def open(self):
+        """Открытие хранилища (для памяти ничего не требуется)"""
+
+    async def close(self):
+        """Закрытие хранилища (для памяти ничего не требуется)"""
+
+    async def create_tables(self):
+        """Создание таблиц (структуры создаются в конструкторе)"""
+
+    async def flush(self):
+        """Все записи в памяти применяются сразу"""
+
+    def get_pool_metrics(self) -> dict:
+        """Метрики соединений (у хранилища в памяти их нет)"""
+        return {}
+
+    def _insert(self, table: str, row: dict) -> bool:
+        """Вставка строки с обновлением сводных данных, как это делают триггеры"""
+        if row.get("id") is None:
+            row["id"] = next(self._ids[table])
+            while row["id"] in self._known_ids[table]:
+                row["id"] = next(self._ids[table])
+        elif row["id"] in self._known_ids[table]:
+            return False
+        self._known_ids[table].add(row["id"])
+        self._rows[table][row["user_id"]].append(row)
+
+        if table == "workouts":
+            self._add_to_totals(row)
+        elif table == "meal_diary":
+            self._add_to_daily(row)
+        return True
+
+    def _add_to_totals(self, row: dict):
+        """Обновление итогов тренировок пользователя"""
+        totals = self._workout_totals.setdefault(row["user_id"], [0, 0, 0, 0, None])
+        totals[0] += 1
+        totals[1] += row["duration"] or 0
+        totals[2] += row["calories_burned"] or 0
+        totals[3] += row["exercises_completed"] or 0
+        totals[4] = max(filter(None, (totals[4], row["completed_at"])), default=None)
+
+    def _add_to_daily(self, row: dict):
+        """Обновление дневных итогов питания"""
+        day = datetime.fromtimestamp(row["recorded_at"]).date()
+        key = (row["user_id"], f"{day:%Y-%m-%d}")
+        daily = self._meal_daily.setdefault(key, [0, 0, 0, 0, 0])
+        daily[0] += row["calories"] or 0
+        daily[1] += row["proteins"] or 0
+        daily[2] += row["fats"] or 0
+        daily[3] += row["carbs"] or 0
+        daily[4] += 1
+
+    def _user(self, user_id: int) -> dict:
+        """Строка пользователя, создаваемая при первом обращении"""
+        return self._users.setdefault(user_id, {
+            "user_id": user_id, "username": None, "registered_at": _timestamp(),
+            "timezone": None
+        })
+
+    async def add_user(self, user_id: int, username: str = None):
+        """Добавление нового пользователя"""
+        if user_id not in self._users:
+            self._user(user_id)["username"] = username
+
+    async def save_workout(self, user_id: int, workout_type: str, duration: int,
+                          calories_burned: int, exercises_completed: int):
+        """Сохранение информации о завершенной тренировке"""
+        self._insert("workouts", {
+            "user_id": user_id, "workout_type": workout_type, "duration": duration,
+            "calories_burned": calories_burned, "exercises_completed": exercises_completed,
+            "completed_at": _timestamp()
+        })
+
+    async def record_weight(self, user_id: int, weight: float):
+        """Запись веса пользователя"""
+        self._insert("weight_records", {
+            "user_id": user_id, "weight": weight, "recorded_at": _timestamp()
+        })
+
+    async def record_measurements(self, user_id: int, chest: float, waist: float,
+                                hips: float, biceps: float, thighs: float):
+        """Запись измерений тела"""
+        self._insert("measurements", {
+            "user_id": user_id, "chest": chest, "waist": waist, "hips": hips,
+            "biceps": biceps, "thighs": thighs, "recorded_at": _timestamp()
+        })
+
+    async def add_meal_entry(self, user_id: int, meal_name: str, calories: float,
+                             proteins: float, fats: float, carbs: float):
+        """Запись приема пищи в дневник питания"""
+        self._insert("meal_diary", {
+            "user_id": user_id, "meal_name": meal_name, "calories": calories,
+            "proteins": proteins, "fats": fats, "carbs": carbs,
+            "recorded_at": _timestamp()
+        })
+
+    async def get_user_statistics(self, user_id: int) -> tuple:
+        """Получение общей статистики пользователя"""
+        totals = self._workout_totals.get(user_id)
+        if not totals:
+            return (0, None, None, None)
+        return tuple(totals[:4])
+
+    async def rebuild_workout_totals(self) -> int:
+        """Пересчет сводных итогов тренировок по всей истории"""
+        self._workout_totals = {}
+        for rows in self._rows["workouts"].values():
+            for row in rows:
+                self._add_to_totals(row)
+        return len(self._workout_totals)
+
+    async def export_rows(self, table: str, batch_rows: int = 5000):
+        """Чтение всех строк таблицы пачками: (список колонок, строки)"""
+        columns = TABLE_COLUMNS[table]
+        if table in self._keyed:
+            rows = list(self._keyed[table].values())
+        elif table == "reminder_deliveries":
+            rows = [dict(zip(columns, delivery)) for delivery in sorted(self._deliveries)]
+        else:
+            rows = [row for user_rows in self._rows[table].values() for row in user_rows]
+
+        for start in range(0, len(rows), batch_rows):
+            yield list(columns), [tuple(row.get(column) for column in columns)
+                                  for row in rows[start:start + batch_rows]]
+
+    async def import_rows(self, table: str, columns: list, rows: list) -> int:
+        """Массовая вставка строк (перенос данных между хранилищами)"""
+        imported = 0
+        touched = set()
+        for values in rows:
+            row = dict(zip(columns, values))
+            if table in self._keyed:
+                if row["user_id"] not in self._keyed[table]:
+                    self._keyed[table][row["user_id"]] = row
+                    imported += 1
+            elif table == "reminder_deliveries":
+                delivery = tuple(row[column] for column in TABLE_COLUMNS[table])
+                if delivery not in self._deliveries:
+                    self._deliveries.add(delivery)
+                    imported += 1
+            elif self._insert(table, row):
+                touched.add(row["user_id"])
+                imported += 1
+
+        # Восстанавливаем порядок по времени у пользователей с перенесенными строками
+        if table in TIME_COLUMNS:
+            time_column = TIME_COLUMNS[table]
+            for user_id in touched:
+                self._rows[table][user_id].sort(key=lambda row: row[time_column] or 0)
+        return imported
+
+    async def get_latest_weight(self, user_id: int):
+        """Получение последнего записанного веса пользователя"""
+        rows = self._rows["weight_records"].get(user_id)
+        return rows[-1]["weight"] if rows else None
+
+    async def get_weight_history(self, user_id: int) -> list:
+        """Получение истории изменения веса"""
+        rows = self._rows["weight_records"].get(user_id, [])
+        return [(row["weight"], row["recorded_at"]) for row in reversed(rows[-10:])]
+
+    async def get_measurements_history(self, user_id: int) -> list:
+        """Получение истории измерений"""
+        rows = self._rows["measurements"].get(user_id, [])
+        return [
+            (row["chest"], row["waist"], row["hips"], row["biceps"], row["thighs"],
+             row["recorded_at"])
+            for row in reversed(rows[-5:])
+        ]
+
+    async def get_recent_workouts(self, user_id: int, limit: int = 5) -> list:
+        """Получение последних тренировок пользователя"""
+        rows = self._rows["workouts"].get(user_id, [])
+        return [
+            (row["workout_type"], row["duration"], row["calories_burned"], row["completed_at"])
+            for row in reversed(rows[-limit:] if limit > 0 else [])
+        ]
+
+    async def save_workout_reminder(self, user_id: int, minute_of_day: int, days_mask: int):
+        """Сохранение напоминания о тренировках"""
+        self._keyed["workout_reminders"][user_id] = {
+            "user_id": user_id, "minute_of_day": minute_of_day, "days_mask": days_mask,
+            "is_active": True, "created_at": _timestamp(), "next_fire_at": None
+        }
+
+    async def save_meal_reminder(self, user_id: int, meal_count: int, meal_minutes: list):
+        """Сохранение напоминания о питании"""
+        self._keyed["meal_reminders"][user_id] = {
+            "user_id": user_id, "meal_count": meal_count,
+            "meal_minutes": pack_minutes(meal_minutes),
+            "is_active": True, "created_at": _timestamp(), "next_fire_at": None
+        }
+
+    def _active_reminder(self, table: str, user_id: int):
+        """Активная строка напоминаний пользователя"""
+        row = self._keyed[table].get(user_id)
+        return row if row and row["is_active"] else None
+
+    async def get_workout_reminders(self, user_id: int) -> tuple:
+        """Получение напоминаний о тренировках"""
+        row = self._active_reminder("workout_reminders", user_id)
+        return (row["minute_of_day"], row["days_mask"]) if row else None
+
+    async def get_meal_reminders(self, user_id: int) -> tuple:
+        """Получение напоминаний о питании"""
+        row = self._active_reminder("meal_reminders", user_id)
+        return (row["meal_count"], unpack_minutes(row["meal_minutes"])) if row else None
+
+    async def get_due_reminders(self, since, until: int) -> list:
+        """Активные напоминания с моментом срабатывания в [since, until):
+        (тип, user_id, минуты от начала суток, маска дней, часовой пояс, next_fire_at).
+        При since=None возвращаются и еще не запланированные напоминания"""
+        reminders = []
+        for kind, table in REMINDER_TABLES.items():
+            for user_id, row in self._keyed[table].items():
+                if not row["is_active"]:
+                    continue
+                next_fire_at = row["next_fire_at"]
+                if next_fire_at is None:
+                    if since is not None:
+                        continue
+                elif not ((since is None or since <= next_fire_at) and next_fire_at < until):
+                    continue
+                if kind == "workout":
+                    minutes, days_mask = (row["minute_of_day"],), row["days_mask"]
+                else:
+                    minutes, days_mask = unpack_minutes(row["meal_minutes"]), ALL_DAYS_MASK
+                user = self._users.get(user_id)
+                reminders.append((kind, user_id, minutes, days_mask, user and user["timezone"],
+                                  next_fire_at))
+        return reminders
+
+    async def update_next_fire_times(self, updates: list):
+        """Сохранение следующих моментов срабатывания: [(тип, user_id, next_fire_at)]"""
+        for kind, user_id, next_fire_at in updates:
+            row = self._keyed[REMINDER_TABLES[kind]].get(user_id)
+            if row:
+                row["next_fire_at"] = next_fire_at
+
+    async def record_deliveries(self, deliveries: list):
+        """Запись доставленных напоминаний вместе с переходом к следующему срабатыванию:
+        [(тип, user_id, слот, next_fire_at)]"""
+        for kind, user_id, slot, next_fire_at in deliveries:
+            self._deliveries.add((slot, user_id, REMINDER_IDS[kind]))
+            row = self._keyed[REMINDER_TABLES[kind]].get(user_id)
+            if row and row["next_fire_at"] == slot:
+                row["next_fire_at"] = next_fire_at
+
+    async def get_delivered_slots(self, since: int) -> set:
+        """Доставленные напоминания со слотом не раньше since: {(тип, user_id, слот)}"""
+        kinds = {reminder_id: kind for kind, reminder_id in REMINDER_IDS.items()}
+        return {(kinds[reminder_id], user_id, slot)
+                for slot, user_id, reminder_id in self._deliveries if slot >= since}
+
+    async def prune_deliveries(self, before: int) -> int:
+        """Удаление записей журнала доставки со слотом раньше before"""
+        stale = {delivery for delivery in self._deliveries if delivery[0] < before}
+        self._deliveries -= stale
+        return len(stale)
+
+    async def save_workout_sessions(self, changes: list):
+        """Запись изменений незавершенных тренировок: [(user_id, состояние)];
+        состояние None удаляет сессию"""
+        sessions = self._keyed["workout_sessions"]
+        for user_id, state in changes:
+            if state is None:
+                sessions.pop(user_id, None)
+            else:
+                sessions[user_id] = dict(zip(TABLE_COLUMNS["workout_sessions"], (user_id, *state)))
+
+    async def get_workout_session(self, user_id: int):
+        """Сохраненное состояние незавершенной тренировки или None"""
+        row = self._keyed["workout_sessions"].get(user_id)
+        return tuple(row[column] for column in TABLE_COLUMNS["workout_sessions"][1:]) if row else None
+
+    async def take_stale_workout_sessions(self, before: int) -> list:
+        """Удаление и возврат тренировок без активности с момента before:
+        [(user_id, состояние)]"""
+        sessions = self._keyed["workout_sessions"]
+        stale = [user_id for user_id, row in sessions.items() if row["last_activity"] < before]
+        taken = [(user_id, await self.get_workout_session(user_id)) for user_id in stale]
+        for user_id in stale:
+            del sessions[user_id]
+        return taken
+
+    async def get_user_timezone(self, user_id: int):
+        """Получение часового пояса пользователя (None - пояс по умолчанию)"""
+        user = self._users.get(user_id)
+        return user["timezone"] if user else None
+
+    async def set_user_timezone(self, user_id: int, timezone: str):
+        """Сохранение часового пояса пользователя"""
+        self._user(user_id)["timezone"] = timezone
+
+    async def get_media_file_ids(self) -> dict:
+        """Все сохраненные file_id картинок: {адрес: file_id}"""
+        return dict(self._media_files)
+
+    async def save_media_file_id(self, url: str, file_id: str):
+        """Сохранение file_id картинки, загруженной по адресу url"""
+        self._media_files[url] = file_id
+
+    async def get_day_nutrition(self, user_id: int, day: date = None) -> tuple:
+        """Получение итогов питания и списка приемов пищи за день"""
+        day = day or datetime.now().date()
+        totals = self._meal_daily.get((user_id, f"{day:%Y-%m-%d}"))
+        if not totals:
+            return (0, 0, 0, 0, 0), []
+
+        day_start, day_end = local_day_bounds(day)
+        meals = [
+            (row["meal_name"], row["calories"], row["proteins"], row["fats"], row["carbs"],
+             row["recorded_at"])
+            for row in self._rows["meal_diary"].get(user_id, [])
+            if day_start <= row["recorded_at"] < day_end
+        ]
+        return tuple(totals), meals
@@ -0,0 +1,609 @@
+import logging
+import sqlite3
+
+from schedules import days_to_mask, pack_minutes, parse_time
+
+async def _compact_reminder_schedules(db):
+    """Перевод расписаний напоминаний из строк в маску дней и минуты от начала суток"""
+    await db.execute("""
+        CREATE TABLE workout_reminders_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            minute_of_day INTEGER NOT NULL,
+            days_mask INTEGER NOT NULL,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+            next_fire_at INTEGER,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE meal_reminders_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            meal_count INTEGER,
+            meal_minutes BLOB NOT NULL,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+            next_fire_at INTEGER,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+    """)
+
+    workout_rows = []
+    async with db.execute(
+        "SELECT id, user_id, time, days, is_active, created_at, next_fire_at FROM workout_reminders"
+    ) as cursor:
+        async for row_id, user_id, time, days, is_active, created_at, next_fire_at in cursor:
+            try:
+                workout_rows.append((row_id, user_id, parse_time(time), days_to_mask(days),
+                                     is_active, created_at, next_fire_at))
+            except (ValueError, AttributeError):
+                logging.error(f"Пропущено некорректное напоминание о тренировках №{row_id}")
+
+    meal_rows = []
+    async with db.execute(
+        """
+        SELECT id, user_id, meal_count, meal_times, is_active, created_at, next_fire_at
+        FROM meal_reminders
+        """
+    ) as cursor:
+        async for row_id, user_id, meal_count, meal_times, is_active, created_at, next_fire_at \
+                in cursor:
+            try:
+                minutes = [parse_time(value) for value in meal_times.split(',')]
+                meal_rows.append((row_id, user_id, meal_count, pack_minutes(minutes),
+                                  is_active, created_at, next_fire_at))
+            except (ValueError, AttributeError):
+                logging.error(f"Пропущено некорректное напоминание о питании №{row_id}")
+
+    await db.executemany(
+        "INSERT INTO workout_reminders_new VALUES (?, ?, ?, ?, ?, ?, ?)", workout_rows
+    )
+    await db.executemany(
+        "INSERT INTO meal_reminders_new VALUES (?, ?, ?, ?, ?, ?, ?)", meal_rows
+    )
+
+    for statement in (
+        "DROP TABLE workout_reminders",
+        "ALTER TABLE workout_reminders_new RENAME TO workout_reminders",
+        """CREATE INDEX idx_workout_reminders_user
+            ON workout_reminders (user_id, is_active, created_at, minute_of_day, days_mask)""",
+        """CREATE INDEX idx_workout_reminders_due
+            ON workout_reminders (next_fire_at) WHERE is_active = TRUE""",
+        "DROP TABLE meal_reminders",
+        "ALTER TABLE meal_reminders_new RENAME TO meal_reminders",
+        """CREATE INDEX idx_meal_reminders_user
+            ON meal_reminders (user_id, is_active, created_at, meal_count, meal_minutes)""",
+        """CREATE INDEX idx_meal_reminders_due
+            ON meal_reminders (next_fire_at) WHERE is_active = TRUE""",
+    ):
+        await db.execute(statement)
+
+# Миграции схемы базы данных. Номер миграции равен ее позиции в списке,
+# текущая версия схемы хранится в PRAGMA user_version. Миграции только
+# дополняют схему и не удаляют данные; уже примененные не изменяются.
+# Миграция - это SQL-скрипт или асинхронная функция, получающая соединение,
+# если преобразование данных не выражается на SQL.
+MIGRATIONS = [
+    # 1: базовая схема
+    """
+    -- Таблица пользователей
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY,
+        username TEXT,
+        registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Таблица тренировок
+    CREATE TABLE IF NOT EXISTS workouts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        workout_type TEXT,
+        duration INTEGER,
+        calories_burned INTEGER,
+        exercises_completed INTEGER,
+        completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+
+    -- Таблица записей веса
+    CREATE TABLE IF NOT EXISTS weight_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        weight REAL,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+
+    -- Таблица измерений тела
+    CREATE TABLE IF NOT EXISTS measurements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        chest REAL,
+        waist REAL,
+        hips REAL,
+        biceps REAL,
+        thighs REAL,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+
+    -- Таблица напоминаний о тренировках
+    CREATE TABLE IF NOT EXISTS workout_reminders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        time TEXT,
+        days TEXT,
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+
+    -- Таблица напоминаний о питании
+    CREATE TABLE IF NOT EXISTS meal_reminders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        meal_count INTEGER,
+        meal_times TEXT,
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+
+    -- Таблица дневника питания
+    CREATE TABLE IF NOT EXISTS meal_diary (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        meal_name TEXT,
+        calories REAL,
+        proteins REAL,
+        fats REAL,
+        carbs REAL,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    """,
+
+    # 2: покрывающие индексы для выборок по пользователю и времени
+    """
+    CREATE INDEX IF NOT EXISTS idx_workouts_user_time
+        ON workouts (user_id, completed_at, workout_type, duration,
+                     calories_burned, exercises_completed);
+
+    CREATE INDEX IF NOT EXISTS idx_weight_records_user_time
+        ON weight_records (user_id, recorded_at, weight);
+
+    CREATE INDEX IF NOT EXISTS idx_measurements_user_time
+        ON measurements (user_id, recorded_at, chest, waist, hips, biceps, thighs);
+
+    CREATE INDEX IF NOT EXISTS idx_meal_diary_user_time
+        ON meal_diary (user_id, recorded_at);
+
+    CREATE INDEX IF NOT EXISTS idx_workout_reminders_user
+        ON workout_reminders (user_id, is_active, created_at, time, days);
+
+    CREATE INDEX IF NOT EXISTS idx_meal_reminders_user
+        ON meal_reminders (user_id, is_active, created_at, meal_count, meal_times);
+    """,
+
+    # 3: сводные итоги тренировок пользователя, обновляемые триггером
+    """
+    CREATE TABLE IF NOT EXISTS user_workout_totals (
+        user_id INTEGER PRIMARY KEY,
+        total_workouts INTEGER NOT NULL DEFAULT 0,
+        total_duration INTEGER NOT NULL DEFAULT 0,
+        total_calories INTEGER NOT NULL DEFAULT 0,
+        total_exercises INTEGER NOT NULL DEFAULT 0,
+        last_workout_at TIMESTAMP
+    );
+
+    CREATE TRIGGER IF NOT EXISTS trg_workouts_totals
+    AFTER INSERT ON workouts
+    BEGIN
+        INSERT INTO user_workout_totals (
+            user_id, total_workouts, total_duration, total_calories,
+            total_exercises, last_workout_at
+        ) VALUES (
+            NEW.user_id, 1, COALESCE(NEW.duration, 0), COALESCE(NEW.calories_burned, 0),
+            COALESCE(NEW.exercises_completed, 0), NEW.completed_at
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_workouts = total_workouts + 1,
+            total_duration = total_duration + excluded.total_duration,
+            total_calories = total_calories + excluded.total_calories,
+            total_exercises = total_exercises + excluded.total_exercises,
+            last_workout_at = MAX(COALESCE(last_workout_at, excluded.last_workout_at),
+                                  excluded.last_workout_at);
+    END;
+
+    INSERT OR REPLACE INTO user_workout_totals
+    SELECT user_id, COUNT(*), COALESCE(SUM(duration), 0), COALESCE(SUM(calories_burned), 0),
+           COALESCE(SUM(exercises_completed), 0), MAX(completed_at)
+    FROM workouts
+    GROUP BY user_id;
+    """,
+
+    # 4: дневные итоги питания и покрывающий индекс для выборки приемов пищи за день
+    """
+    CREATE TABLE IF NOT EXISTS meal_diary_daily (
+        user_id INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        total_calories REAL NOT NULL DEFAULT 0,
+        total_proteins REAL NOT NULL DEFAULT 0,
+        total_fats REAL NOT NULL DEFAULT 0,
+        total_carbs REAL NOT NULL DEFAULT 0,
+        meals_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day)
+    ) WITHOUT ROWID;
+
+    CREATE TRIGGER IF NOT EXISTS trg_meal_diary_daily
+    AFTER INSERT ON meal_diary
+    BEGIN
+        INSERT INTO meal_diary_daily (
+            user_id, day, total_calories, total_proteins, total_fats, total_carbs, meals_count
+        ) VALUES (
+            NEW.user_id, date(NEW.recorded_at), COALESCE(NEW.calories, 0),
+            COALESCE(NEW.proteins, 0), COALESCE(NEW.fats, 0), COALESCE(NEW.carbs, 0), 1
+        )
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            total_calories = total_calories + excluded.total_calories,
+            total_proteins = total_proteins + excluded.total_proteins,
+            total_fats = total_fats + excluded.total_fats,
+            total_carbs = total_carbs + excluded.total_carbs,
+            meals_count = meals_count + 1;
+    END;
+
+    INSERT OR REPLACE INTO meal_diary_daily
+    SELECT user_id, date(recorded_at), COALESCE(SUM(calories), 0), COALESCE(SUM(proteins), 0),
+           COALESCE(SUM(fats), 0), COALESCE(SUM(carbs), 0), COUNT(*)
+    FROM meal_diary
+    GROUP BY user_id, date(recorded_at);
+
+    DROP INDEX IF EXISTS idx_meal_diary_user_time;
+    CREATE INDEX idx_meal_diary_user_time
+        ON meal_diary (user_id, recorded_at, meal_name, calories, proteins, fats, carbs);
+    """,
+
+    # 5: время хранится целым числом секунд эпохи (UTC). Таблицы пересоздаются
+    # с переносом данных; записи дневника питания были в локальном времени.
+    """
+    CREATE TABLE users_new (
+        user_id INTEGER PRIMARY KEY,
+        username TEXT,
+        registered_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+    );
+    INSERT INTO users_new
+    SELECT user_id, username, CAST(strftime('%s', registered_at) AS INTEGER) FROM users;
+    DROP TABLE users;
+    ALTER TABLE users_new RENAME TO users;
+
+    CREATE TABLE workouts_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        workout_type TEXT,
+        duration INTEGER,
+        calories_burned INTEGER,
+        exercises_completed INTEGER,
+        completed_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    INSERT INTO workouts_new
+    SELECT id, user_id, workout_type, duration, calories_burned, exercises_completed,
+           CAST(strftime('%s', completed_at) AS INTEGER)
+    FROM workouts;
+    DROP TABLE workouts;
+    ALTER TABLE workouts_new RENAME TO workouts;
+    CREATE INDEX idx_workouts_user_time
+        ON workouts (user_id, completed_at, workout_type, duration,
+                     calories_burned, exercises_completed);
+
+    CREATE TABLE weight_records_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        weight REAL,
+        recorded_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    INSERT INTO weight_records_new
+    SELECT id, user_id, weight, CAST(strftime('%s', recorded_at) AS INTEGER)
+    FROM weight_records;
+    DROP TABLE weight_records;
+    ALTER TABLE weight_records_new RENAME TO weight_records;
+    CREATE INDEX idx_weight_records_user_time
+        ON weight_records (user_id, recorded_at, weight);
+
+    CREATE TABLE measurements_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        chest REAL,
+        waist REAL,
+        hips REAL,
+        biceps REAL,
+        thighs REAL,
+        recorded_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    INSERT INTO measurements_new
+    SELECT id, user_id, chest, waist, hips, biceps, thighs,
+           CAST(strftime('%s', recorded_at) AS INTEGER)
+    FROM measurements;
+    DROP TABLE measurements;
+    ALTER TABLE measurements_new RENAME TO measurements;
+    CREATE INDEX idx_measurements_user_time
+        ON measurements (user_id, recorded_at, chest, waist, hips, biceps, thighs);
+
+    CREATE TABLE workout_reminders_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        time TEXT,
+        days TEXT,
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    INSERT INTO workout_reminders_new
+    SELECT id, user_id, time, days, is_active, CAST(strftime('%s', created_at) AS INTEGER)
+    FROM workout_reminders;
+    DROP TABLE workout_reminders;
+    ALTER TABLE workout_reminders_new RENAME TO workout_reminders;
+    CREATE INDEX idx_workout_reminders_user
+        ON workout_reminders (user_id, is_active, created_at, time, days);
+
+    CREATE TABLE meal_reminders_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        meal_count INTEGER,
+        meal_times TEXT,
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    INSERT INTO meal_reminders_new
+    SELECT id, user_id, meal_count, meal_times, is_active,
+           CAST(strftime('%s', created_at) AS INTEGER)
+    FROM meal_reminders;
+    DROP TABLE meal_reminders;
+    ALTER TABLE meal_reminders_new RENAME TO meal_reminders;
+    CREATE INDEX idx_meal_reminders_user
+        ON meal_reminders (user_id, is_active, created_at, meal_count, meal_times);
+
+    CREATE TABLE meal_diary_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        meal_name TEXT,
+        calories REAL,
+        proteins REAL,
+        fats REAL,
+        carbs REAL,
+        recorded_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    INSERT INTO meal_diary_new
+    SELECT id, user_id, meal_name, calories, proteins, fats, carbs,
+           CAST(strftime('%s', recorded_at, 'utc') AS INTEGER)
+    FROM meal_diary;
+    DROP TABLE meal_diary;
+    ALTER TABLE meal_diary_new RENAME TO meal_diary;
+    CREATE INDEX idx_meal_diary_user_time
+        ON meal_diary (user_id, recorded_at, meal_name, calories, proteins, fats, carbs);
+
+    -- Сводные таблицы и их триггеры пересоздаются под новый формат времени
+    DROP TABLE user_workout_totals;
+    CREATE TABLE user_workout_totals (
+        user_id INTEGER PRIMARY KEY,
+        total_workouts INTEGER NOT NULL DEFAULT 0,
+        total_duration INTEGER NOT NULL DEFAULT 0,
+        total_calories INTEGER NOT NULL DEFAULT 0,
+        total_exercises INTEGER NOT NULL DEFAULT 0,
+        last_workout_at INTEGER
+    );
+    INSERT INTO user_workout_totals
+    SELECT user_id, COUNT(*), COALESCE(SUM(duration), 0), COALESCE(SUM(calories_burned), 0),
+           COALESCE(SUM(exercises_completed), 0), MAX(completed_at)
+    FROM workouts
+    GROUP BY user_id;
+
+    CREATE TRIGGER trg_workouts_totals
+    AFTER INSERT ON workouts
+    BEGIN
+        INSERT INTO user_workout_totals (
+            user_id, total_workouts, total_duration, total_calories,
+            total_exercises, last_workout_at
+        ) VALUES (
+            NEW.user_id, 1, COALESCE(NEW.duration, 0), COALESCE(NEW.calories_burned, 0),
+            COALESCE(NEW.exercises_completed, 0), NEW.completed_at
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_workouts = total_workouts + 1,
+            total_duration = total_duration + excluded.total_duration,
+            total_calories = total_calories + excluded.total_calories,
+            total_exercises = total_exercises + excluded.total_exercises,
+            last_workout_at = MAX(COALESCE(last_workout_at, excluded.last_workout_at),
+                                  excluded.last_workout_at);
+    END;
+
+    -- День в дневной сводке питания остается локальной датой сервера
+    CREATE TRIGGER trg_meal_diary_daily
+    AFTER INSERT ON meal_diary
+    BEGIN
+        INSERT INTO meal_diary_daily (
+            user_id, day, total_calories, total_proteins, total_fats, total_carbs, meals_count
+        ) VALUES (
+            NEW.user_id, date(NEW.recorded_at, 'unixepoch', 'localtime'),
+            COALESCE(NEW.calories, 0), COALESCE(NEW.proteins, 0),
+            COALESCE(NEW.fats, 0), COALESCE(NEW.carbs, 0), 1
+        )
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            total_calories = total_calories + excluded.total_calories,
+            total_proteins = total_proteins + excluded.total_proteins,
+            total_fats = total_fats + excluded.total_fats,
+            total_carbs = total_carbs + excluded.total_carbs,
+            meals_count = meals_count + 1;
+    END;
+    """,
+
+    # 6: часовой пояс пользователя и предвычисленный момент следующего напоминания
+    """
+    -- NULL означает часовой пояс по умолчанию из настроек бота
+    ALTER TABLE users ADD COLUMN timezone TEXT;
+
+    ALTER TABLE workout_reminders ADD COLUMN next_fire_at INTEGER;
+    ALTER TABLE meal_reminders ADD COLUMN next_fire_at INTEGER;
+
+    -- Активным остается только последнее расписание пользователя
+    UPDATE workout_reminders SET is_active = FALSE
+    WHERE is_active = TRUE AND id NOT IN (
+        SELECT MAX(id) FROM workout_reminders WHERE is_active = TRUE GROUP BY user_id
+    );
+    UPDATE meal_reminders SET is_active = FALSE
+    WHERE is_active = TRUE AND id NOT IN (
+        SELECT MAX(id) FROM meal_reminders WHERE is_active = TRUE GROUP BY user_id
+    );
+
+    -- Выборка напоминаний, срабатывающих в интервале, идет по частичному индексу
+    CREATE INDEX idx_workout_reminders_due
+        ON workout_reminders (next_fire_at) WHERE is_active = TRUE;
+    CREATE INDEX idx_meal_reminders_due
+        ON meal_reminders (next_fire_at) WHERE is_active = TRUE;
+    """,
+
+    # 7: расписания напоминаний в виде маски дней и минут от начала суток
+    _compact_reminder_schedules,
+
+    # 8: одна строка напоминаний на пользователя; история сворачивается
+    # до последнего активного расписания
+    """
+    CREATE TABLE workout_reminders_new (
+        user_id INTEGER PRIMARY KEY,
+        minute_of_day INTEGER NOT NULL,
+        days_mask INTEGER NOT NULL,
+        is_active BOOLEAN NOT NULL DEFAULT TRUE,
+        created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        next_fire_at INTEGER,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    INSERT INTO workout_reminders_new
+    SELECT user_id, minute_of_day, days_mask, is_active, created_at, next_fire_at
+    FROM workout_reminders
+    WHERE id IN (
+        SELECT MAX(id) FROM workout_reminders
+        WHERE is_active = TRUE AND user_id IS NOT NULL
+        GROUP BY user_id
+    );
+    DROP TABLE workout_reminders;
+    ALTER TABLE workout_reminders_new RENAME TO workout_reminders;
+    CREATE INDEX idx_workout_reminders_due
+        ON workout_reminders (next_fire_at) WHERE is_active = TRUE;
+
+    CREATE TABLE meal_reminders_new (
+        user_id INTEGER PRIMARY KEY,
+        meal_count INTEGER,
+        meal_minutes BLOB NOT NULL,
+        is_active BOOLEAN NOT NULL DEFAULT TRUE,
+        created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        next_fire_at INTEGER,
+        FOREIGN KEY (user_id) REFERENCES users (user_id)
+    );
+    INSERT INTO meal_reminders_new
+    SELECT user_id, meal_count, meal_minutes, is_active, created_at, next_fire_at
+    FROM meal_reminders
+    WHERE id IN (
+        SELECT MAX(id) FROM meal_reminders
+        WHERE is_active = TRUE AND user_id IS NOT NULL
+        GROUP BY user_id
+    );
+    DROP TABLE meal_reminders;
+    ALTER TABLE meal_reminders_new RENAME TO meal_reminders;
+    CREATE INDEX idx_meal_reminders_due
+        ON meal_reminders (next_fire_at) WHERE is_active = TRUE;
+    """,
+
+    # 9: журнал доставленных напоминаний; слот - плановый момент срабатывания.
+    # Слот идет первым в ключе, чтобы старые записи удалялись диапазоном
+    """
+    CREATE TABLE reminder_deliveries (
+        slot_epoch INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        reminder_id INTEGER NOT NULL,
+        PRIMARY KEY (slot_epoch, user_id, reminder_id)
+    ) WITHOUT ROWID;
+    """,
+
+    # 10: журнал незавершенных тренировок для восстановления после перезапуска
+    """
+    CREATE TABLE workout_sessions (
+        user_id INTEGER PRIMARY KEY,
+        workout_type_id INTEGER NOT NULL,
+        current_exercise INTEGER NOT NULL,
+        completed_exercises INTEGER NOT NULL,
+        started_at INTEGER NOT NULL,
+        last_activity INTEGER NOT NULL
+    );
+    CREATE INDEX idx_workout_sessions_activity ON workout_sessions (last_activity);
+    """,
+
+    # 11: file_id загруженных в Telegram картинок по их исходному адресу
+    """
+    CREATE TABLE media_files (
+        url TEXT PRIMARY KEY,
+        file_id TEXT NOT NULL
+    ) WITHOUT ROWID;
+    """,
+]
+
+# Актуальная версия схемы
+SCHEMA_VERSION = len(MIGRATIONS)
+
+async def get_schema_version(db) -> int:
+    """Получение текущей версии схемы"""
+    async with db.execute("PRAGMA user_version") as cursor:
+        row = await cursor.fetchone()
+    return row[0]
+
+def _split_statements(script: str) -> list:
+    """Разбиение SQL-скрипта на отдельные команды (с учетом тел триггеров)"""
+    statements = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        statements.append(buffer.strip())
+    return statements
+
+async def apply_migrations(db) -> int:
+    """Применение недостающих миграций, возвращает итоговую версию схемы"""
+    version = await get_schema_version(db)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    for number in range(version + 1, SCHEMA_VERSION + 1):
+        migration = MIGRATIONS[number - 1]
+        # Каждая миграция вместе с номером версии применяется одной транзакцией.
+        # BEGIN IMMEDIATE сразу берет блокировку записи, а версия перечитывается
+        # уже под ней: если базу одновременно открыл другой процесс (шарды
+        # manage.py, несколько воркеров), его миграции не повторяются
+        try:
+            await db.execute("BEGIN IMMEDIATE")
+            if await get_schema_version(db) >= number:
+                await db.rollback()
+                continue
+            logging.info(f"Применение миграции схемы №{number}")
+            if callable(migration):
+                await migration(db)
+            else:
+                # executescript фиксирует открытую транзакцию, поэтому
+                # команды скрипта выполняются по одной
+                for statement in _split_statements(migration):
+                    await db.execute(statement)
+            await db.execute(f"PRAGMA user_version = {number}")
+            await db.commit()
+        except Exception:
+            if db.in_transaction:
+                await db.rollback()
+            raise
+
+    return await get_schema_version(db)
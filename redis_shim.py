@@ -0,0 +1,196 @@
+import argparse
+import asyncio
+import logging
+import time
+
+# Минимальный сервер с протоколом Redis для локальной проверки FSM_STORAGE=redis:
+# только команды, которые использует хранилище состояний aiogram (GET, SET с EX/PX,
+# DEL), и несколько служебных. Данные живут в памяти процесса.
+# Запуск: python redis_shim.py --port 6379
+
+# Как часто удаляются ключи с истекшим сроком жизни, в секундах
+EXPIRE_SWEEP_INTERVAL = 10
+
+class RedisShim:
+    """Хранилище ключей со сроком жизни и обработчик протокола RESP"""
+
+    def __init__(self):
+        # Ключ -> значение и момент истечения по time.monotonic() (None - бессрочно)
+        self._data = {}
+        self._expires = {}
+
+    def _alive(self, key: bytes) -> bool:
+        """Проверка ключа с ленивым удалением истекшего"""
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            del self._expires[key]
+        return key in self._data
+
+    def sweep(self) -> int:
+        """Удаление всех истекших ключей"""
+        now = time.monotonic()
+        expired = [key for key, expires_at in self._expires.items() if expires_at <= now]
+        for key in expired:
+            self._data.pop(key, None)
+            del self._expires[key]
+        return len(expired)
+
+    def execute(self, command: list):
+        """Выполнение команды; возвращает ответ для кодирования в RESP"""
+        name = command[0].upper()
+        args = command[1:]
+        if name == b"HELLO":
+            # Версию протокола запоминает подключение; ответы RESP2 и RESP3
+            # различаются только кодированием словаря и пустого значения
+            return {b"server": b"redis", b"version": b"7.0.0",
+                    b"proto": int(args[0]) if args else 2, b"mode": b"standalone"}
+        if name == b"PING":
+            return args[0] if args else SimpleString(b"PONG")
+        if name == b"GET":
+            return self._data.get(args[0]) if self._alive(args[0]) else None
+        if name == b"SET":
+            return self._set(args)
+        if name == b"DEL":
+            deleted = 0
+            for key in args:
+                if self._alive(key):
+                    del self._data[key]
+                    self._expires.pop(key, None)
+                    deleted += 1
+            return deleted
+        if name == b"EXISTS":
+            return sum(1 for key in args if self._alive(key))
+        if name == b"EXPIRE":
+            if not self._alive(args[0]):
+                return 0
+            self._expires[args[0]] = time.monotonic() + int(args[1])
+            return 1
+        if name == b"TTL":
+            if not self._alive(args[0]):
+                return -2
+            expires_at = self._expires.get(args[0])
+            return -1 if expires_at is None else int(expires_at - time.monotonic() + 0.999)
+        if name == b"DBSIZE":
+            return sum(1 for key in list(self._data) if self._alive(key))
+        if name == b"FLUSHDB" or name == b"FLUSHALL":
+            self._data.clear()
+            self._expires.clear()
+            return SimpleString(b"OK")
+        if name in (b"SELECT", b"CLIENT"):
+            # Одна база на всех; служебные команды клиента просто подтверждаются
+            return SimpleString(b"OK")
+        return Error(f"ERR unknown command '{name.decode(errors='replace')}'".encode())
+
+    def _set(self, args: list):
+        """SET key value [EX seconds | PX milliseconds] [NX | XX]"""
+        key, value = args[0], args[1]
+        ttl = None
+        only_new = only_existing = False
+        options = iter(args[2:])
+        for option in options:
+            option = option.upper()
+            if option == b"EX":
+                ttl = int(next(options))
+            elif option == b"PX":
+                ttl = int(next(options)) / 1000
+            elif option == b"NX":
+                only_new = True
+            elif option == b"XX":
+                only_existing = True
+            else:
+                return Error(b"ERR syntax error")
+
+        exists = self._alive(key)
+        if (only_new and exists) or (only_existing and not exists):
+            return None
+        self._data[key] = value
+        if ttl is None:
+            self._expires.pop(key, None)
+        else:
+            self._expires[key] = time.monotonic() + ttl
+        return SimpleString(b"OK")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обслуживание одного подключения"""
+        protocol = 2
+        try:
+            while True:
+                command = await read_command(reader)
+                if command is None:
+                    break
+                if command and command[0].upper() == b"QUIT":
+                    writer.write(encode(SimpleString(b"OK")))
+                    break
+                reply = self.execute(command) if command else Error(b"ERR empty command")
+                if isinstance(reply, dict):
+                    protocol = reply[b"proto"]
+                writer.write(encode(reply, protocol))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+class SimpleString(bytes):
+    """Ответ "+..." протокола RESP"""
+
+class Error(bytes):
+    """Ответ "-..." протокола RESP"""
+
+async def read_command(reader: asyncio.StreamReader):
+    """Чтение команды RESP (массив bulk-строк); None - соединение закрыто"""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Строчный формат (например, из telnet)
+        return line.split()
+    command = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        length = int(header[1:])
+        command.append((await reader.readexactly(length + 2))[:-2])
+    return command
+
+def encode(value, protocol: int = 2) -> bytes:
+    """Кодирование ответа в RESP"""
+    if isinstance(value, dict):
+        items = b"".join(encode(key) + encode(item) for key, item in value.items())
+        if protocol == 3:
+            return b"%%%d\r\n" % len(value) + items
+        return b"*%d\r\n" % (2 * len(value)) + items
+    if value is None:
+        return b"_\r\n" if protocol == 3 else b"$-1\r\n"
+    if isinstance(value, SimpleString):
+        return b"+" + value + b"\r\n"
+    if isinstance(value, Error):
+        return b"-" + value + b"\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+async def serve(host: str, port: int):
+    """Запуск сервера и периодического удаления истекших ключей"""
+    shim = RedisShim()
+    server = await asyncio.start_server(shim.handle, host, port)
+    logging.info(f"Заглушка Redis слушает {host}:{port}")
+    async with server:
+        while True:
+            await asyncio.sleep(EXPIRE_SWEEP_INTERVAL)
+            shim.sweep()
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальная заглушка Redis для хранилища состояний")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logging.info("Заглушка Redis остановлена")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import count
+
+import pytz
+
+from config import DEFAULT_TIMEZONE
+from schedules import ALL_DAYS_MASK
+
+# Тексты напоминаний по типу расписания
+REMINDER_TEXTS = {
+    "workout": "🏋️ Пора на тренировку! Откройте раздел «Тренировки» и начните занятие.",
+    "meal": "🍽 Время приема пищи! Не забудьте записать его в дневник питания.",
+}
+
+# Горизонт в секундах, на который срабатывания загружаются из базы в кучу,
+# и запас, с которым загружается следующее окно
+SCHEDULE_WINDOW = 15 * 60
+WINDOW_PRELOAD = 60
+
+# Напоминания, пропущенные за время остановки бота, отправляются при запуске,
+# если опоздание не превышает этого значения; более старые переносятся
+MISSED_GRACE = 10 * 60
+
+# Журнал доставки пишется пачками раз в интервал, записи старше срока хранения
+# удаляются раз в час
+DELIVERY_FLUSH_INTERVAL = 1
+DELIVERY_RETENTION = 2 * 24 * 60 * 60
+DELIVERY_PRUNE_INTERVAL = 60 * 60
+
+def get_timezone(name: str = None):
+    """Часовой пояс по имени; пустое или неизвестное имя - пояс по умолчанию"""
+    try:
+        return pytz.timezone(name or DEFAULT_TIMEZONE)
+    except pytz.UnknownTimeZoneError:
+        return pytz.timezone(DEFAULT_TIMEZONE)
+
+def next_fire_time(minutes: tuple, days_mask: int, tz, after: float) -> int:
+    """Ближайший момент срабатывания строго после after (секунды эпохи)
+    по местному времени пользователя; minutes отсортированы по возрастанию"""
+    now = datetime.fromtimestamp(after, tz)
+    # Неделя плюс один день покрывает случай, когда единственное время сегодня уже прошло
+    for offset in range(8):
+        day = now.date() + timedelta(days=offset)
+        if not days_mask >> day.weekday() & 1:
+            continue
+        for minute in minutes:
+            local = datetime.combine(day, datetime.min.time()) + timedelta(minutes=minute)
+            fire_at = int(tz.localize(local).timestamp())
+            if fire_at > after:
+                return fire_at
+    return None
+
+class ReminderScheduler:
+    """Планировщик напоминаний на куче ближайших моментов срабатывания.
+
+    Момент следующего срабатывания хранится в базе (next_fire_at), в куче
+    держатся только напоминания ближайшего окна SCHEDULE_WINDOW, а следующее
+    окно читается одним запросом по индексу next_fire_at"""
+
+    def __init__(self, delivery, db, window: int = SCHEDULE_WINDOW):
+        self.delivery = delivery
+        self.db = db
+        self.window = window
+        # Куча (момент срабатывания, номер записи, ключ); ключ - (тип, user_id)
+        self._heap = []
+        # Актуальный номер записи кучи и разобранное расписание для каждого ключа.
+        # Записи кучи не удаляются при изменении расписания, а пропускаются
+        # при извлечении, если их номер устарел
+        self._entries = {}
+        self._schedules = {}
+        self._seq = count()
+        # Граница загруженного окна: все срабатывания раньше нее уже в куче
+        self._loaded_until = 0
+        self._changed = asyncio.Event()
+        self._task = None
+        # Доставленные, но еще не записанные в журнал напоминания
+        self._delivered = []
+        self._flush_task = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def start(self):
+        """Загрузка ближайшего окна и пропущенных напоминаний, запуск цикла отправки"""
+        now = int(time.time())
+        self._loaded_until = now + self.window
+        # next_fire_at сдвигается только после записи доставки, поэтому прошедший
+        # момент означает, что рассылка этого слота была прервана остановкой бота
+        delivered = await self.db.get_delivered_slots(now - MISSED_GRACE)
+        updates = []
+        for kind, user_id, minutes, days_mask, timezone, next_fire_at in \
+                await self.db.get_due_reminders(None, self._loaded_until):
+            key = self._load(kind, user_id, minutes, days_mask, timezone)
+            # Не запланированные и слишком давно пропущенные переносятся на ближайшее время
+            if next_fire_at is None or next_fire_at < now - MISSED_GRACE:
+                next_fire_at = next_fire_time(*self._schedules[key], now)
+                updates.append((kind, user_id, next_fire_at))
+            elif (kind, user_id, next_fire_at) in delivered:
+                next_fire_at = next_fire_time(*self._schedules[key], next_fire_at)
+                updates.append((kind, user_id, next_fire_at))
+            self._push(key, next_fire_at)
+        await self.db.update_next_fire_times(updates)
+
+        logging.info(f"Загружено напоминаний ближайшего окна: {len(self._entries)}")
+        self._task = asyncio.create_task(self._run())
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Остановка цикла отправки и запись накопленного журнала доставки"""
+        for task in (self._task, self._flush_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._flush_task = None
+        await self._flush_deliveries()
+
+    async def schedule(self, kind: str, user_id: int, minutes, days_mask: int = ALL_DAYS_MASK):
+        """Планирование нового расписания пользователя после его сохранения"""
+        timezone = await self.db.get_user_timezone(user_id)
+        await self._reschedule([(kind, user_id, minutes, days_mask, timezone)])
+
+    async def reschedule_user(self, user_id: int, timezone: str):
+        """Перепланирование всех напоминаний пользователя (после смены часового пояса)"""
+        reminders = []
+        workout = await self.db.get_workout_reminders(user_id)
+        if workout:
+            reminders.append(("workout", user_id, (workout[0],), workout[1], timezone))
+        meal = await self.db.get_meal_reminders(user_id)
+        if meal:
+            reminders.append(("meal", user_id, meal[1], ALL_DAYS_MASK, timezone))
+        await self._reschedule(reminders)
+
+    async def _reschedule(self, reminders: list):
+        """Расчет, сохранение и постановка в кучу следующих срабатываний"""
+        now = time.time()
+        updates = []
+        for kind, user_id, minutes, days_mask, timezone in reminders:
+            key = self._load(kind, user_id, minutes, days_mask, timezone)
+            next_fire_at = next_fire_time(*self._schedules[key], now)
+            updates.append((kind, user_id, next_fire_at))
+            self._push(key, next_fire_at)
+        await self.db.update_next_fire_times(updates)
+
+    def _load(self, kind: str, user_id: int, minutes, days_mask: int, timezone) -> tuple:
+        """Запоминание расписания пользователя, возвращает его ключ"""
+        key = (kind, user_id)
+        self._schedules[key] = (tuple(sorted(minutes)), days_mask, get_timezone(timezone))
+        return key
+
+    def _push(self, key: tuple, fire_at: int):
+        """Постановка срабатывания в кучу за O(log n), если оно попадает в окно"""
+        if fire_at is None or fire_at >= self._loaded_until:
+            # Срабатывание будет прочитано из базы вместе со своим окном
+            self._entries.pop(key, None)
+            self._schedules.pop(key, None)
+            return
+        seq = next(self._seq)
+        self._entries[key] = seq
+        heapq.heappush(self._heap, (fire_at, seq, key))
+
+        # Будим цикл, только если новое срабатывание раньше того, до которого он спит
+        if self._heap[0][1] == seq:
+            self._changed.set()
+        self._compact()
+
+    def _compact(self):
+        """Перестроение кучи, когда устаревших записей становится больше актуальных"""
+        if len(self._heap) > 2 * len(self._entries) + 1024:
+            self._heap = [item for item in self._heap if self._entries.get(item[2]) == item[1]]
+            heapq.heapify(self._heap)
+
+    async def _load_window(self):
+        """Чтение из базы срабатываний следующего окна одним запросом по индексу"""
+        since = self._loaded_until
+        self._loaded_until = since + self.window
+        for kind, user_id, minutes, days_mask, timezone, next_fire_at in \
+                await self.db.get_due_reminders(since, self._loaded_until):
+            if (kind, user_id) not in self._entries:
+                self._push(self._load(kind, user_id, minutes, days_mask, timezone), next_fire_at)
+
+    async def _run(self):
+        """Цикл отправки: сон ровно до ближайшего срабатывания или до загрузки окна"""
+        while True:
+            now = time.time()
+            if now >= self._loaded_until - WINDOW_PRELOAD:
+                await self._load_window()
+
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, seq, key = heapq.heappop(self._heap)
+                if self._entries.get(key) != seq:
+                    continue
+                del self._entries[key]
+                next_fire_at = next_fire_time(*self._schedules[key], max(now, fire_at))
+                self._fire(key, fire_at, next_fire_at)
+                self._push(key, next_fire_at)
+
+            self._changed.clear()
+            wake_at = self._loaded_until - WINDOW_PRELOAD
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            try:
+                await asyncio.wait_for(self._changed.wait(), wake_at - time.time())
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, key: tuple, slot: int, next_fire_at: int):
+        """Постановка напоминания в очередь отправки без ожидания.
+        После отправки слот попадает в журнал, а next_fire_at в базе сдвигается"""
+        kind, user_id = key
+        self.delivery.enqueue(
+            user_id, REMINDER_TEXTS[kind],
+            on_done=partial(self._delivered.append, (kind, user_id, slot, next_fire_at))
+        )
+
+    async def _flush_deliveries(self):
+        """Запись накопленных доставок одной транзакцией"""
+        if not self._delivered:
+            return
+        batch, self._delivered = self._delivered, []
+        try:
+            await self.db.record_deliveries(batch)
+        except Exception as e:
+            logging.error(f"Ошибка при записи журнала доставки напоминаний: {e}")
+            self._delivered[:0] = batch
+
+    async def _flush_loop(self):
+        """Периодическая запись журнала доставки и удаление старых записей"""
+        pruned_at = 0
+        while True:
+            await asyncio.sleep(DELIVERY_FLUSH_INTERVAL)
+            await self._flush_deliveries()
+
+            now = time.time()
+            if now - pruned_at >= DELIVERY_PRUNE_INTERVAL:
+                try:
+                    await self.db.prune_deliveries(int(now - DELIVERY_RETENTION))
+                except Exception as e:
+                    logging.error(f"Ошибка при очистке журнала доставки напоминаний: {e}")
+                pruned_at = now
@@ -0,0 +1,34 @@
+import asyncio
+import logging
+
+# Сколько независимых вызовов API одного ответа выполняются одновременно
+RESPONSE_CONCURRENCY = 4
+
+async def answer_callback(callback, text: str = None):
+    """Подтверждение нажатия кнопки, чтобы у пользователя сразу пропал индикатор
+    загрузки; ошибка (например, устаревший запрос) не прерывает обработку"""
+    try:
+        await callback.answer(text)
+    except Exception as e:
+        logging.error(f"Ошибка при ответе на callback: {e}")
+
+async def gather_calls(*calls, limit: int = RESPONSE_CONCURRENCY) -> list:
+    """Параллельное выполнение независимых вызовов, не более limit одновременно.
+    Ошибки возвращаются в списке результатов и не прерывают остальные вызовы"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(call):
+        async with semaphore:
+            return await call
+
+    return await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+
+async def replace_message(message, send):
+    """Отправка нового сообщения (send - вызов отправки) одновременно с удалением
+    старого. Ошибка отправки пробрасывается, ошибка удаления только пишется в лог"""
+    sent, deleted = await gather_calls(send, message.delete())
+    if isinstance(deleted, Exception):
+        logging.error(f"Ошибка при удалении сообщения: {deleted}")
+    if isinstance(sent, BaseException):
+        raise sent
+    return sent
@@ -0,0 +1,47 @@
+import sys
+from array import array
+
+# Дни недели; бит i маски дней соответствует дню i (0 - понедельник)
+WEEKDAY_NAMES = ("Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье")
+WEEKDAY_SHORT_NAMES = ("Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс")
+ALL_DAYS_MASK = 0b1111111
+
+def parse_time(value: str) -> int:
+    """Разбор времени "ЧЧ:ММ" в минуты от начала суток"""
+    hour, minute = map(int, value.split(':'))
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError(f"Некорректное время: {value}")
+    return hour * 60 + minute
+
+def format_time(minute_of_day: int) -> str:
+    """Минуты от начала суток в формате ЧЧ:ММ"""
+    return f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+def days_to_mask(days: str) -> int:
+    """Строка номеров дней "1,3,5" (1 - понедельник) в маску дней"""
+    mask = 0
+    for day in days.split(','):
+        number = int(day)
+        if not 1 <= number <= 7:
+            raise ValueError(f"Некорректный день недели: {day}")
+        mask |= 1 << (number - 1)
+    return mask
+
+def format_days(days_mask: int) -> str:
+    """Маска дней в виде списка коротких названий: Пн, Ср, Пт"""
+    return ', '.join(name for bit, name in enumerate(WEEKDAY_SHORT_NAMES) if days_mask >> bit & 1)
+
+def pack_minutes(minutes) -> bytes:
+    """Упаковка списка минут в BLOB: по два байта на время, little-endian"""
+    packed = array('H', minutes)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+def unpack_minutes(blob: bytes) -> tuple:
+    """Распаковка минут из BLOB"""
+    packed = array('H')
+    packed.frombytes(blob)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return tuple(packed)
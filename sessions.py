@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+import logging
+import time
+
+from config import INACTIVITY_TIMEOUT
+from workout_manager import WorkoutSession
+
+# Интервал проверки истекших сессий в секундах
+SESSION_CHECK_INTERVAL = 60
+
+# Изменения сессий пишутся в журнал пачками раз в интервал
+SESSION_FLUSH_INTERVAL = 1
+
+class SessionRegistry:
+    """Активные тренировки пользователей с истечением по неактивности.
+
+    Для каждой сессии в куче лежит одна запись с моментом истечения, рассчитанным
+    при постановке. Активность сессии кучу не трогает: при извлечении запись,
+    срок которой сдвинулся, ставится обратно, поэтому проверка обходит только
+    истекшие записи, а не все сессии.
+
+    Состояние сессий дублируется в таблице workout_sessions: изменения копятся
+    в памяти и пишутся пачкой раз в SESSION_FLUSH_INTERVAL. После перезапуска
+    сессия читается из базы при первом обращении пользователя"""
+
+    def __init__(self, db, delivery, timeout: int = INACTIVITY_TIMEOUT):
+        self.db = db
+        self.delivery = delivery
+        self.timeout = timeout
+        self._sessions = {}
+        # Куча (момент истечения, user_id)
+        self._heap = []
+        # Незаписанные изменения: user_id -> сессия или None для удаления
+        self._dirty = {}
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._sessions
+
+    async def get(self, user_id: int):
+        """Активная сессия пользователя или None; после перезапуска
+        сессия восстанавливается из журнала"""
+        session = self._sessions.get(user_id)
+        if session is not None:
+            return session
+        # Удаление еще не записано - строка в базе уже неактуальна
+        if user_id in self._dirty:
+            return None
+
+        state = await self.db.get_workout_session(user_id)
+        if user_id in self._sessions or user_id in self._dirty:
+            # Пока шло чтение, сессию успели создать или завершить
+            return self._sessions.get(user_id)
+        if state is None:
+            return None
+
+        session = WorkoutSession.from_state(state)
+        if session.is_inactive(self.timeout):
+            self._dirty[user_id] = None
+            await self._finish(user_id, session)
+            return None
+        self._sessions[user_id] = session
+        heapq.heappush(self._heap, (self._expires_at(session), user_id))
+        return session
+
+    def add(self, user_id: int, session):
+        """Регистрация новой сессии; прежняя сессия пользователя заменяется"""
+        replaced = user_id in self._sessions
+        self._sessions[user_id] = session
+        self._dirty[user_id] = session
+        # У замененной сессии запись в куче уже есть и будет перенесена при извлечении
+        if not replaced:
+            heapq.heappush(self._heap, (self._expires_at(session), user_id))
+
+    def touch(self, user_id: int):
+        """Отметка изменения сессии для записи в журнал; в базу не обращается"""
+        session = self._sessions.get(user_id)
+        if session is not None:
+            self._dirty[user_id] = session
+
+    async def pop(self, user_id: int):
+        """Удаление сессии; ее запись в куче пропускается при извлечении"""
+        session = await self.get(user_id)
+        if session is not None:
+            del self._sessions[user_id]
+            self._dirty[user_id] = None
+        return session
+
+    def _expires_at(self, session) -> float:
+        """Момент истечения сессии по time.monotonic()"""
+        return session.last_activity + self.timeout
+
+    def start(self):
+        """Запуск записи журнала и периодической проверки"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Остановка проверки и запись накопленных изменений"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self):
+        """Запись накопленных изменений сессий одной транзакцией"""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+        try:
+            await self.db.save_workout_sessions([
+                (user_id, session and session.to_state()) for user_id, session in dirty.items()
+            ])
+        except Exception as e:
+            logging.error(f"Ошибка при записи журнала тренировок: {e}")
+            # Более новые изменения, появившиеся во время записи, не затираем
+            dirty.update(self._dirty)
+            self._dirty = dirty
+
+    async def expire(self, now: float = None) -> list:
+        """Завершение и сохранение сессий, неактивных дольше таймаута.
+        Возвращает список пользователей, чьи сессии завершены"""
+        if now is None:
+            now = time.monotonic()
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, user_id = heapq.heappop(self._heap)
+            session = self._sessions.get(user_id)
+            if session is None:
+                continue
+            expires_at = self._expires_at(session)
+            if expires_at > now:
+                # Была активность после постановки - переносим запись
+                heapq.heappush(self._heap, (expires_at, user_id))
+                continue
+            del self._sessions[user_id]
+            self._dirty[user_id] = None
+            expired.append(user_id)
+            await self._finish(user_id, session)
+        return expired
+
+    async def expire_stored(self) -> list:
+        """Завершение истекших сессий из журнала, которые не загружались
+        после перезапуска; выборка идет по индексу last_activity"""
+        expired = []
+        for user_id, state in await self.db.take_stale_workout_sessions(
+                int(time.time() - self.timeout)):
+            # Загруженные сессии завершаются по куче
+            if user_id in self._sessions or user_id in self._dirty:
+                continue
+            expired.append(user_id)
+            await self._finish(user_id, WorkoutSession.from_state(state))
+        return expired
+
+    async def _finish(self, user_id: int, session):
+        """Сохранение тренировки, прерванной по неактивности, и уведомление"""
+        if session.exercises:
+            # Длительность считается до последней активности, без времени простоя
+            summary = session.get_workout_summary(session.last_activity)
+            try:
+                await self.db.save_workout(
+                    user_id,
+                    summary['workout_type'],
+                    summary['duration'],
+                    summary['calories_burned'],
+                    summary['exercises_completed']
+                )
+            except Exception as e:
+                logging.error(f"Ошибка при сохранении тренировки пользователя {user_id}: {e}")
+        self.delivery.enqueue(
+            user_id,
+            "Тренировка была автоматически завершена из-за отсутствия активности. "
+            "Результаты сохранены."
+        )
+
+    async def _run(self):
+        """Цикл записи журнала и проверки истекших сессий"""
+        checked_at = time.monotonic()
+        while True:
+            await asyncio.sleep(SESSION_FLUSH_INTERVAL)
+            await self.flush()
+
+            if time.monotonic() - checked_at < SESSION_CHECK_INTERVAL:
+                continue
+            checked_at = time.monotonic()
+            try:
+                expired = await self.expire() + await self.expire_stored()
+                if expired:
+                    logging.info(f"Завершено неактивных тренировок: {len(expired)}")
+            except Exception as e:
+                logging.error(f"Ошибка при проверке неактивных тренировок: {e}")
@@ -0,0 +1,114 @@
+import json
+from datetime import date
+from functools import partial
+from typing import AsyncIterator, Optional, Protocol
+
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from config import DB_BACKEND, FSM_STORAGE, REDIS_URL, FSM_STATE_TTL, FSM_DATA_TTL
+from database import create_database
+from memory_database import MemoryDatabase
+
+# Обработчики получают хранилище через внедрение зависимостей диспетчера
+# (параметр db) и не зависят от конкретной реализации
+class StorageBackend(Protocol):
+    """Интерфейс хранилища данных бота"""
+
+    async def open(self): ...
+
+    async def close(self): ...
+
+    async def create_tables(self): ...
+
+    async def flush(self): ...
+
+    def get_pool_metrics(self) -> dict: ...
+
+    async def add_user(self, user_id: int, username: str = None): ...
+
+    async def save_workout(self, user_id: int, workout_type: str, duration: int,
+                          calories_burned: int, exercises_completed: int): ...
+
+    async def record_weight(self, user_id: int, weight: float): ...
+
+    async def record_measurements(self, user_id: int, chest: float, waist: float,
+                                hips: float, biceps: float, thighs: float): ...
+
+    async def add_meal_entry(self, user_id: int, meal_name: str, calories: float,
+                             proteins: float, fats: float, carbs: float): ...
+
+    async def get_user_statistics(self, user_id: int) -> tuple: ...
+
+    async def rebuild_workout_totals(self) -> int: ...
+
+    def export_rows(self, table: str, batch_rows: int = 5000) -> AsyncIterator[tuple]: ...
+
+    async def import_rows(self, table: str, columns: list, rows: list) -> int: ...
+
+    async def get_latest_weight(self, user_id: int) -> Optional[float]: ...
+
+    async def get_weight_history(self, user_id: int) -> list: ...
+
+    async def get_measurements_history(self, user_id: int) -> list: ...
+
+    async def get_recent_workouts(self, user_id: int, limit: int = 5) -> list: ...
+
+    async def save_workout_reminder(self, user_id: int, minute_of_day: int, days_mask: int): ...
+
+    async def save_meal_reminder(self, user_id: int, meal_count: int, meal_minutes: list): ...
+
+    async def get_workout_reminders(self, user_id: int) -> tuple: ...
+
+    async def get_meal_reminders(self, user_id: int) -> tuple: ...
+
+    async def get_due_reminders(self, since, until: int) -> list: ...
+
+    async def update_next_fire_times(self, updates: list): ...
+
+    async def record_deliveries(self, deliveries: list): ...
+
+    async def get_delivered_slots(self, since: int) -> set: ...
+
+    async def prune_deliveries(self, before: int) -> int: ...
+
+    async def save_workout_sessions(self, changes: list): ...
+
+    async def get_workout_session(self, user_id: int): ...
+
+    async def take_stale_workout_sessions(self, before: int) -> list: ...
+
+    async def get_user_timezone(self, user_id: int) -> Optional[str]: ...
+
+    async def set_user_timezone(self, user_id: int, timezone: str): ...
+
+    async def get_day_nutrition(self, user_id: int, day: date = None) -> tuple: ...
+
+    async def get_media_file_ids(self) -> dict: ...
+
+    async def save_media_file_id(self, url: str, file_id: str): ...
+
+def create_storage(backend: str = DB_BACKEND) -> StorageBackend:
+    """Создание хранилища выбранного типа: sqlite или memory"""
+    if backend == "memory":
+        return MemoryDatabase()
+    if backend == "sqlite":
+        return create_database()
+    raise ValueError(f"Неизвестный тип хранилища: {backend}")
+
+def create_fsm_storage(backend: str = FSM_STORAGE) -> BaseStorage:
+    """Создание хранилища состояний диалогов: memory или redis"""
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "redis":
+        # redis нужен только для этого режима
+        from aiogram.fsm.storage.redis import RedisStorage
+        return RedisStorage.from_url(
+            REDIS_URL,
+            state_ttl=FSM_STATE_TTL or None,
+            data_ttl=FSM_DATA_TTL or None,
+            # Данные диалогов пишутся компактным JSON: без пробелов и с кириллицей
+            # в UTF-8 вместо шестибайтовых \uXXXX
+            json_dumps=partial(json.dumps, ensure_ascii=False, separators=(',', ':')),
+        )
+    raise ValueError(f"Неизвестный тип хранилища состояний: {backend}")
@@ -1,72 +1,110 @@
-from datetime import datetime, timedelta
-from config import WORKOUT_TYPES, CALORIES_PER_MINUTE, EXERCISES
-
-class WorkoutSession:
-    def __init__(self):
-        self.current_exercise = 0
-        self.exercises = []
-        self.start_time = None
-        self.last_activity = None
-        self.completed_exercises = 0
-        self.workout_type = None
-        
-    def start_workout(self, workout_type):
-        """Начало тренировки"""
-        self.workout_type = workout_type
-        self.start_time = datetime.now()
-        self.last_activity = datetime.now()
-        self.exercises = self._get_exercises_for_type(workout_type)
-        if not self.exercises:
-            return "Упражнения для данного типа тренировки не найдены"
-        return self.exercises[0]
-
-    def next_exercise(self):
-        """Переход к следующему упражнению"""
-        if self.current_exercise < len(self.exercises) - 1:
-            self.current_exercise += 1
-            self.completed_exercises += 1
-            self.last_activity = datetime.now()
-            return self.exercises[self.current_exercise]
-        return None
-
-    def previous_exercise(self):
-        """Возврат к предыдущему упражнению"""
-        if self.current_exercise > 0:
-            self.current_exercise -= 1
-            self.last_activity = datetime.now()
-            return self.exercises[self.current_exercise]
-        return None
-
-    def get_current_exercise(self):
-        """Получение текущего упражнения"""
-        return self.exercises[self.current_exercise]
-
-    def update_activity(self):
-        """Обновление времени последней активности"""
-        self.last_activity = datetime.now()
-
-    def is_inactive(self, timeout_minutes):
-        """Проверка на неактивность"""
-        if not self.last_activity:
-            return False
-        return (datetime.now() - self.last_activity) > timedelta(minutes=timeout_minutes)
-
-    def get_workout_summary(self):
-        """Получение сводки по тренировке"""
-        duration = (datetime.now() - self.start_time).seconds // 60  # в минутах
-        calories = self._calculate_calories(duration)
-        
-        return {
-            'duration': duration,
-            'calories_burned': calories,
-            'exercises_completed': self.completed_exercises,
-            'workout_type': self.workout_type
-        }
-
-    def _calculate_calories(self, duration):
-        """Расчет сожженных калорий"""
-        return CALORIES_PER_MINUTE.get(self.workout_type, 3) * duration
-
-    def _get_exercises_for_type(self, workout_type):
-        """Получение списка упражнений для типа тренировки"""
-        return EXERCISES.get(workout_type, [])
\ No newline at end of file
+import time
+from config import CALORIES_PER_MINUTE, EXERCISES
+
+# Типы тренировок по порядку; в сессии хранится номер типа, а не строка и не список упражнений
+WORKOUT_TYPE_IDS = tuple(EXERCISES)
+_WORKOUT_TYPE_INDEX = {workout_type: type_id for type_id, workout_type in enumerate(WORKOUT_TYPE_IDS)}
+
+class WorkoutSession:
+    """Сессия тренировки: номер типа, позиция, счетчик и моменты по time.monotonic()"""
+    __slots__ = ('workout_type_id', 'current_exercise', 'completed_exercises',
+                 'start_time', 'last_activity')
+
+    def __init__(self):
+        self.workout_type_id = -1
+        self.current_exercise = 0
+        self.completed_exercises = 0
+        self.start_time = None
+        self.last_activity = None
+
+    @property
+    def workout_type(self):
+        """Строковый тип тренировки"""
+        if self.workout_type_id < 0:
+            return None
+        return WORKOUT_TYPE_IDS[self.workout_type_id]
+
+    @property
+    def exercises(self):
+        """Упражнения тренировки; список общий для всех сессий и не копируется"""
+        if self.workout_type_id < 0:
+            return []
+        return EXERCISES[WORKOUT_TYPE_IDS[self.workout_type_id]]
+
+    def start_workout(self, workout_type):
+        """Начало тренировки"""
+        self.workout_type_id = _WORKOUT_TYPE_INDEX.get(workout_type, -1)
+        self.start_time = self.last_activity = time.monotonic()
+        exercises = self.exercises
+        if not exercises:
+            return "Упражнения для данного типа тренировки не найдены"
+        return exercises[0]
+
+    def next_exercise(self):
+        """Переход к следующему упражнению"""
+        exercises = self.exercises
+        if self.current_exercise < len(exercises) - 1:
+            self.current_exercise += 1
+            self.completed_exercises += 1
+            self.last_activity = time.monotonic()
+            return exercises[self.current_exercise]
+        return None
+
+    def previous_exercise(self):
+        """Возврат к предыдущему упражнению"""
+        if self.current_exercise > 0:
+            self.current_exercise -= 1
+            self.last_activity = time.monotonic()
+            return self.exercises[self.current_exercise]
+        return None
+
+    def get_current_exercise(self):
+        """Получение текущего упражнения"""
+        return self.exercises[self.current_exercise]
+
+    def update_activity(self):
+        """Обновление времени последней активности"""
+        self.last_activity = time.monotonic()
+
+    def is_inactive(self, timeout_seconds):
+        """Проверка на неактивность (таймаут в секундах, как INACTIVITY_TIMEOUT)"""
+        if self.last_activity is None:
+            return False
+        return time.monotonic() - self.last_activity > timeout_seconds
+
+    def get_workout_summary(self, end_time=None):
+        """Получение сводки по тренировке (end_time - момент time.monotonic(),
+        по умолчанию текущий)"""
+        if end_time is None:
+            end_time = time.monotonic()
+        duration = int(end_time - self.start_time) // 60  # в минутах
+        calories = self._calculate_calories(duration)
+
+        return {
+            'duration': duration,
+            'calories_burned': calories,
+            'exercises_completed': self.completed_exercises,
+            'workout_type': self.workout_type
+        }
+
+    def to_state(self) -> tuple:
+        """Компактное представление для сохранения: (номер типа, позиция, выполнено,
+        начало, последняя активность); моменты - целые секунды эпохи"""
+        offset = time.time() - time.monotonic()
+        return (self.workout_type_id, self.current_exercise, self.completed_exercises,
+                int(self.start_time + offset), int(self.last_activity + offset))
+
+    @classmethod
+    def from_state(cls, state) -> "WorkoutSession":
+        """Восстановление сессии из представления to_state"""
+        session = cls()
+        offset = time.time() - time.monotonic()
+        (session.workout_type_id, session.current_exercise, session.completed_exercises,
+         start_time, last_activity) = state
+        session.start_time = start_time - offset
+        session.last_activity = last_activity - offset
+        return session
+
+    def _calculate_calories(self, duration):
+        """Расчет сожженных калорий"""
+        return CALORIES_PER_MINUTE.get(self.workout_type, 3) * duration